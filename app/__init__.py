@@ -1,3 +1,13 @@
-from .main import app
+from typing import Any
 
 __all__ = ["app"]
+
+
+# Imported on first access, so that app.verifier and the benchmarks
+# don't load the whole application
+def __getattr__(name: str) -> Any:
+    if name == "app":
+        from .main import app
+
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -24,7 +24,7 @@ class AdminAuth(AuthenticationBackend):
                 return False
             if not user or not user.is_superuser:
                 return False
-            token = users.create_token(user)
+            token = await users.create_token(user)
 
         # And update session
         request.session.update({"token": token.access_token})
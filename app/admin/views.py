@@ -2,9 +2,16 @@ from typing import Any
 
 import humanize
 from sqladmin import ModelView
+from sqlalchemy import select
+from starlette.requests import Request
 
+from app.cache.dependencies import cache
 from app.db import SSOAccountOrm, UserOrm
+from app.db.connection import async_session_factory
 from app.db.utils import naive_utc
+from app.users.cache import user_cache
+from app.users.emails import email_filter
+from app.users.versions import bump_user_version
 
 
 def time_format(m: Any, a: Any) -> Any:
@@ -51,6 +58,48 @@ class UserAdmin(BaseView, model=UserOrm):
         UserOrm.email,
     ]
 
+    # Edits here bypass UserService, so drop the cached user and bump the
+    # principal version like invalidate_principal does: before and after
+    # the commit
+    async def on_model_change(
+        self,
+        data: dict[str, Any],
+        model: Any,
+        is_created: bool,
+        request: Request,
+    ) -> None:
+        email = data.get("email")
+        if email and email != model.email:
+            stmt = select(UserOrm.id).where(UserOrm.email == email)  # noqa
+            async with async_session_factory() as session:
+                if await session.scalar(stmt) is not None:
+                    # Shown in the form instead of an integrity error
+                    raise ValueError("User with this email already exists")
+        # Called before the form is applied, the model has the old values
+        if not is_created:
+            await user_cache.invalidate(user_cache.get_keys(model))
+            await bump_user_version(cache, model.id)
+
+    async def after_model_change(
+        self,
+        data: dict[str, Any],
+        model: Any,
+        is_created: bool,
+        request: Request,
+    ) -> None:
+        if model.email is not None:
+            await email_filter.publish(model.email)
+        await user_cache.invalidate(user_cache.get_keys(model))
+        if not is_created:
+            await bump_user_version(cache, model.id)
+
+    async def on_model_delete(self, model: Any, request: Request) -> None:
+        await bump_user_version(cache, model.id)
+
+    async def after_model_delete(self, model: Any, request: Request) -> None:
+        await user_cache.invalidate(user_cache.get_keys(model))
+        await bump_user_version(cache, model.id)
+
 
 class SSOAccountAdmin(BaseView, model=SSOAccountOrm):
     name = "SSO Account"
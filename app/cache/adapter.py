@@ -3,6 +3,39 @@ from typing import Any, cast as _cast, overload, Literal
 
 from redis.asyncio import Redis
 
+# KEYS[1] - value, KEYS[2] - attempt counter,
+# ARGV - expected value, max attempts
+CONSUME_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if not value then
+    return 0
+end
+if value == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return 1
+end
+local attempts = redis.call('INCR', KEYS[2])
+if attempts == 1 then
+    redis.call('PEXPIRE', KEYS[2], math.max(redis.call('PTTL', KEYS[1]), 1))
+end
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1], KEYS[2])
+end
+return 0
+"""
+
+# KEYS[1] - attempt counter, ARGV - max attempts, counter ttl
+ATTEMPT_SCRIPT = """
+local attempts = redis.call('INCR', KEYS[1])
+if attempts == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+if attempts > tonumber(ARGV[1]) then
+    return 0
+end
+return 1
+"""
+
 
 class CacheAdapter:
     client: Redis
@@ -11,6 +44,8 @@ class CacheAdapter:
     def __init__(self, redis: Redis, *, key: str = "fastapi"):
         self.client = redis
         self.key = key
+        self.consume_script = redis.register_script(CONSUME_SCRIPT)
+        self.attempt_script = redis.register_script(ATTEMPT_SCRIPT)
 
     async def add(
         self, key: str, value: Any, expire: int | None = None
@@ -49,5 +84,29 @@ class CacheAdapter:
         keys = await self.client.keys(f"{self.key}:{pattern}")
         return set(keys)
 
+    async def incr(self, key: str, amount: int = 1) -> int:
+        return await self.client.incr(f"{self.key}:{key}", amount)
+
+    async def consume(
+        self, key: str, value: Any, *, max_attempts: int
+    ) -> bool:
+        """Deletes the key if it holds the value. The key is also deleted
+        after max_attempts mismatches."""
+        consumed = await self.consume_script(
+            keys=[f"{self.key}:{key}", f"{self.key}:{key}:attempts"],
+            args=[json.dumps(value, ensure_ascii=True), max_attempts],
+        )
+        return bool(consumed)
+
+    async def attempt(
+        self, key: str, *, max_attempts: int, expire: int
+    ) -> bool:
+        """Counts an attempt. False once more than max_attempts were made
+        within expire seconds of the first one."""
+        allowed = await self.attempt_script(
+            keys=[f"{self.key}:{key}"], args=[max_attempts, expire]
+        )
+        return bool(allowed)
+
     async def delete(self, key: str) -> Any:
         return await self.client.delete(f"{self.key}:{key}")
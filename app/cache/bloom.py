@@ -0,0 +1,176 @@
+import abc
+import asyncio
+import hashlib
+import logging
+import math
+from typing import AsyncIterator
+
+from redis.asyncio import Redis
+
+from app.cache.broadcast import Subscriber
+from app.obs import panels
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Probabilistic set: no false negatives, false positives at error_rate
+    once capacity items have been added."""
+
+    capacity: int
+    error_rate: float
+    size: int
+    hash_count: int
+    count: int
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def hashes(self, item: str) -> tuple[int, int]:
+        # Kirsch-Mitzenmacher double hashing over one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return h1, h2
+
+    def add(self, item: str) -> None:
+        h1, h2 = self.hashes(item)
+        for i in range(self.hash_count):
+            index = (h1 + i * h2) % self.size
+            self.bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        h1, h2 = self.hashes(item)
+        for i in range(self.hash_count):
+            index = (h1 + i * h2) % self.size
+            if not self.bits[index >> 3] & (1 << (index & 7)):
+                return False
+        return True
+
+    @property
+    def memory(self) -> int:
+        return len(self.bits)
+
+    @property
+    def estimated_error_rate(self) -> float:
+        fill = 1 - math.exp(-self.hash_count * self.count / self.size)
+        return float(fill**self.hash_count)
+
+
+class SharedBloomFilter(abc.ABC):
+    """A Bloom filter in every worker, filled from a source of truth.
+
+    Additions are broadcast over pub/sub. The filter is rebuilt from the
+    source on (re)connection and periodically, which also drops removed
+    items. Until it is loaded every item might be present.
+
+    Publish items only once they are committed to the source. Items
+    received while a rebuild scans are kept in the new filter, so the
+    scan either sees an item or its publish.
+    """
+
+    name: str
+    capacity: int
+    error_rate: float
+    rebuild_interval: int
+    filter: BloomFilter
+    ready: bool
+
+    def __init__(
+        self,
+        redis: Redis,
+        channel: str,
+        *,
+        name: str,
+        capacity: int,
+        error_rate: float,
+        rebuild_interval: int,
+    ):
+        self.name = name
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self.filter = BloomFilter(capacity, error_rate)
+        self.pending: BloomFilter | None = None
+        self.ready = False
+        self.subscriber = Subscriber(
+            redis,
+            channel,
+            self.add,
+            on_connect=self.load,
+            on_disconnect=self.unload,
+        )
+        self.rebuild_task: asyncio.Task[None] | None = None
+        panels.BLOOM_FILTER_ITEMS.labels(filter=name).set_function(
+            lambda: self.filter.count
+        )
+        panels.BLOOM_FILTER_BYTES.labels(filter=name).set_function(
+            lambda: self.filter.memory
+        )
+        panels.BLOOM_FILTER_ERROR_RATE.labels(filter=name).set_function(
+            lambda: self.filter.estimated_error_rate
+        )
+
+    @abc.abstractmethod
+    def scan(self) -> AsyncIterator[str]:
+        """Yields every item of the source of truth."""
+
+    def add(self, item: str) -> None:
+        self.filter.add(item)
+        if self.pending is not None:
+            self.pending.add(item)
+
+    async def publish(self, item: str) -> None:
+        self.add(item)
+        await self.subscriber.publish(item)
+
+    def might_contain(self, item: str) -> bool:
+        return not self.ready or item in self.filter
+
+    async def load(self) -> None:
+        self.pending = BloomFilter(self.capacity, self.error_rate)
+        try:
+            async for item in self.scan():
+                self.pending.add(item)
+            self.filter = self.pending
+        finally:
+            self.pending = None
+        self.ready = True
+        logger.info(
+            "Loaded %d items into the %s filter (%d bytes, error rate %.5f)",
+            self.filter.count,
+            self.name,
+            self.filter.memory,
+            self.filter.estimated_error_rate,
+        )
+
+    def unload(self) -> None:
+        self.ready = False
+
+    async def rebuild(self) -> None:
+        while True:
+            await asyncio.sleep(self.rebuild_interval)
+            try:
+                await self.load()
+            except Exception:
+                logger.exception("Failed to rebuild the %s filter", self.name)
+
+    async def start(self) -> None:
+        self.subscriber.start()
+        if self.rebuild_task is None:
+            self.rebuild_task = asyncio.create_task(self.rebuild())
+
+    async def stop(self) -> None:
+        await self.subscriber.stop()
+        if self.rebuild_task is not None:
+            self.rebuild_task.cancel()
+            self.rebuild_task = None
+        self.unload()
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    """Runs a handler for every message published to a Redis channel.
+
+    The subscription is restored after connection errors. Messages sent
+    in between are lost: on_disconnect and on_connect let the caller stop
+    trusting its state and resync it.
+    """
+
+    redis: Redis
+    channel: str
+    handler: Callable[[str], None]
+    on_connect: Callable[[], Awaitable[None]] | None
+    on_disconnect: Callable[[], None] | None
+    task: asyncio.Task[None] | None
+
+    def __init__(
+        self,
+        redis: Redis,
+        channel: str,
+        handler: Callable[[str], None],
+        *,
+        on_connect: Callable[[], Awaitable[None]] | None = None,
+        on_disconnect: Callable[[], None] | None = None,
+        retry_delay: float = 1.0,
+    ):
+        self.redis = redis
+        self.channel = channel
+        self.handler = handler
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+        self.retry_delay = retry_delay
+        self.task = None
+
+    async def publish(self, message: str) -> None:
+        await self.redis.publish(self.channel, message)
+
+    async def listen(self) -> None:
+        async with self.redis.pubsub() as pubsub:
+            await pubsub.subscribe(self.channel)
+            if self.on_connect is not None:
+                await self.on_connect()
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    self.handler(message["data"].decode())
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Subscription to %s failed", self.channel)
+            if self.on_disconnect is not None:
+                self.on_disconnect()
+            await asyncio.sleep(self.retry_delay)
+
+    def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
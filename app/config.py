@@ -5,8 +5,11 @@ from dotenv import load_dotenv
 
 from app.cache.config import CacheSettings
 from app.db.config import DBSettings
+from app.limiter.config import LimiterSettings
 from app.mail.config import MailSettings
 from app.obs.config import ObservabilitySettings
+from app.outbox.config import OutboxSettings
+from app.personal_tokens.config import PersonalTokenSettings
 from app.schemas import BackendSettings
 from app.oauth.config import GoogleSettings, YandexSettings, TelegramSettings
 from app.users.config import AuthSettings
@@ -38,6 +41,9 @@ class AppSettings(BackendSettings):
     mail: MailSettings = MailSettings()
     cache: CacheSettings = CacheSettings()
     obs: ObservabilitySettings = ObservabilitySettings()
+    limiter: LimiterSettings = LimiterSettings()
+    pat: PersonalTokenSettings = PersonalTokenSettings()
+    outbox: OutboxSettings = OutboxSettings()
 
 
 settings = AppSettings()
@@ -1,7 +1,15 @@
 # Import models for alembic
 
+from app.outbox.models import OutboxOrm
+from app.personal_tokens.models import PersonalTokenOrm
 from app.sso_accounts.models import SSOAccountOrm
 from app.users.models import UserOrm
 from .base import BaseOrm
 
-__all__ = ["BaseOrm", "UserOrm", "SSOAccountOrm"]
+__all__ = [
+    "BaseOrm",
+    "UserOrm",
+    "SSOAccountOrm",
+    "PersonalTokenOrm",
+    "OutboxOrm",
+]
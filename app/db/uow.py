@@ -1,60 +1,103 @@
 from __future__ import annotations
 
-from typing import Any, cast, Self
+import functools
+from typing import Any, Awaitable, Callable, Self
 
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
-    AsyncSessionTransaction,
 )
 
+from app.config import settings
+from app.outbox.repositories import OutboxRepository
+from app.personal_tokens.repositories import PersonalTokenRepository
 from app.sso_accounts.repositories import SSOAccountRepository
+from app.users.cache import user_cache
+from app.users.emails import email_filter
 from app.users.repositories import UserRepository
 
 
 class UOW:
-    session_factory: async_sessionmaker[AsyncSession]
-    session: AsyncSession
-    transaction: AsyncSessionTransaction
+    """Creates the session on first repository access. The session checks
+    out a connection on its first statement, so requests answered from
+    caches never use the database even when they access a repository."""
 
-    users: UserRepository
-    sso_accounts: SSOAccountRepository
+    session_factory: async_sessionmaker[AsyncSession]
+    commit_callbacks: list[Callable[[], Awaitable[Any]]]
 
     def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
         self.session_factory = session_factory
+        self.commit_callbacks = []
+        self._session: AsyncSession | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        # Autobegins a transaction on the first statement
+        if self._session is None:
+            self._session = self.session_factory()
+        return self._session
 
     @property
     def is_opened(self) -> bool:
-        if not self.session:
+        if self._session is None:
             return False
-        return cast(bool, self.session.is_active)
-
-    async def on_open(self) -> None:
-        self.users = UserRepository(self.session)
-        self.sso_accounts = SSOAccountRepository(self.session)
-
-    async def open(self) -> None:
-        self.session = self.session_factory()
-        await self.session.__aenter__()
-        self.transaction = self.session.begin()
-        await self.transaction.__aenter__()
-        await self.on_open()
+        return self._session.in_transaction()
+
+    @functools.cached_property
+    def users(self) -> UserRepository:
+        return UserRepository(
+            self.session,
+            cache=user_cache if settings.auth.user_cache_enabled else None,
+            emails=email_filter
+            if settings.auth.email_filter_enabled
+            else None,
+            after_commit=self.after_commit,
+        )
+
+    @functools.cached_property
+    def sso_accounts(self) -> SSOAccountRepository:
+        return SSOAccountRepository(self.session)
+
+    @functools.cached_property
+    def personal_tokens(self) -> PersonalTokenRepository:
+        return PersonalTokenRepository(self.session)
+
+    @functools.cached_property
+    def outbox(self) -> OutboxRepository:
+        return OutboxRepository(self.session)
 
     async def close(self, type_: Any, value: Any, traceback: Any) -> None:
-        await self.transaction.__aexit__(type_, value, traceback)
-        await self.session.__aexit__(type_, value, traceback)
+        session, self._session = self._session, None
+        callbacks, self.commit_callbacks = self.commit_callbacks, []
+        if session is not None:
+            try:
+                if session.in_transaction():
+                    if type_ is None:
+                        await session.commit()
+                    else:
+                        await session.rollback()
+            finally:
+                await session.close()
+        if type_ is None:
+            for callback in callbacks:
+                await callback()
+
+    def after_commit(self, callback: Callable[[], Awaitable[Any]]) -> None:
+        self.commit_callbacks.append(callback)
 
     async def flush(self) -> None:
-        await self.session.flush()
+        if self._session is not None:
+            await self._session.flush()
 
     async def rollback(self) -> None:
-        await self.session.rollback()
+        if self._session is not None:
+            await self._session.rollback()
 
     async def commit(self) -> None:
-        await self.session.commit()
+        if self._session is not None:
+            await self._session.commit()
 
     async def __aenter__(self) -> Self:
-        await self.open()
         return self
 
     async def __aexit__(self, type_: Any, value: Any, traceback: Any) -> None:
@@ -0,0 +1,24 @@
+from app.limiter.schemas import RateLimitPolicy
+from app.schemas import BackendSettings
+
+
+class LimiterSettings(BackendSettings):
+    limiter_enabled: bool = True
+    # Addresses or networks of reverse proxies whose X-Forwarded-For is
+    # trusted. Without them every client behind a proxy shares its limits
+    limiter_trusted_proxies: list[str] = []
+    limiter_token_ip: RateLimitPolicy = RateLimitPolicy(limit=30, window=60)
+    limiter_token_email: RateLimitPolicy = RateLimitPolicy(
+        limit=10, window=5 * 60
+    )
+    limiter_reset_ip: RateLimitPolicy = RateLimitPolicy(
+        limit=10, window=60 * 60
+    )
+    limiter_reset_email: RateLimitPolicy = RateLimitPolicy(
+        limit=3, window=15 * 60
+    )
+    limiter_code_user: RateLimitPolicy = RateLimitPolicy(
+        limit=5, window=60 * 60
+    )
+    # Minimum interval between two codes sent to the same user
+    code_cooldown: int = 60
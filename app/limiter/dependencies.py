@@ -0,0 +1,85 @@
+import ipaddress
+from typing import Awaitable, Callable
+
+from starlette.requests import Request
+
+from app.cache.dependencies import redis_client
+from app.config import settings
+from app.limiter.exceptions import RateLimited
+from app.limiter.limiter import RateLimiter
+from app.limiter.schemas import RateLimitPolicy
+from app.obs import panels
+
+rate_limiter = RateLimiter(redis_client, key=settings.cache.redis_key)
+trusted_proxies = [
+    ipaddress.ip_network(proxy, strict=False)
+    for proxy in settings.limiter.limiter_trusted_proxies
+]
+
+type KeyFunc = Callable[[Request], Awaitable[str | None]]
+
+
+def is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in trusted_proxies)
+
+
+async def by_ip(request: Request) -> str | None:
+    if request.client is None:
+        return None
+    host = request.client.host
+    if not is_trusted_proxy(host):
+        return host
+    # Clients can forge the start of the header, so the client is the last
+    # address that wasn't appended by a trusted proxy
+    forwarded = request.headers.get("X-Forwarded-For", "").split(",")
+    for value in reversed(forwarded):
+        if not value.strip():
+            continue
+        host = value.strip()
+        if not is_trusted_proxy(host):
+            break
+    return host
+
+
+async def by_email(request: Request) -> str | None:
+    email = request.query_params.get("email")
+    content_type = request.headers.get("Content-Type", "")
+    if email is None and content_type.startswith(
+        ("application/x-www-form-urlencoded", "multipart/form-data")
+    ):
+        # The parsed form is cached on the request for the endpoint
+        value = (await request.form()).get("username")
+        email = value if isinstance(value, str) else None
+    return email.lower() if email else None
+
+
+async def by_user(request: Request) -> str | None:
+    # Set by GetCurrentUser, which must run first
+    user = getattr(request.state, "user", None)
+    return str(user.id) if user is not None else None
+
+
+class RateLimit:
+    def __init__(
+        self, name: str, policy: RateLimitPolicy, key: KeyFunc = by_ip
+    ):
+        self.name = name
+        self.policy = policy
+        self.key = key
+
+    async def __call__(self, request: Request) -> None:
+        if not settings.limiter.limiter_enabled:
+            return
+        ident = await self.key(request)
+        if ident is None:
+            return
+        retry_after = await rate_limiter.hit(
+            f"{self.name}:{ident}", self.policy.limit, self.policy.window
+        )
+        if retry_after:
+            panels.RATE_LIMITED.labels(policy=self.name).inc()
+            raise RateLimited(headers={"Retry-After": str(retry_after)})
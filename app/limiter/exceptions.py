@@ -0,0 +1,9 @@
+from starlette import status
+
+from app.exceptions import BackendError
+
+
+class RateLimited(BackendError):
+    message = "Too many requests, try again later"
+    error_code = "too_many_requests"
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
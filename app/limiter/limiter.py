@@ -0,0 +1,55 @@
+import math
+import secrets
+
+from redis.asyncio import Redis
+
+# KEYS[1] - window zset, ARGV - window (ms), limit, request id
+# Returns 0 if the request is allowed, otherwise ms until a slot frees up
+SLIDING_WINDOW_SCRIPT = """
+local time = redis.call('TIME')
+local now = time[1] * 1000 + math.floor(time[2] / 1000)
+local window = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return 0
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return math.max(1, oldest[2] + window - now)
+"""
+
+
+class RateLimiter:
+    """Sliding window counters: a sorted set of request timestamps per key,
+    trimmed and checked atomically."""
+
+    redis: Redis
+    key: str
+
+    def __init__(self, redis: Redis, *, key: str = "fastapi"):
+        self.redis = redis
+        self.key = key
+        self.sliding_window_script = redis.register_script(
+            SLIDING_WINDOW_SCRIPT
+        )
+
+    def get_key(self, name: str) -> str:
+        return f"{self.key}:limits:{name}"
+
+    async def hit(self, name: str, limit: int, window: int) -> int:
+        """Counts a request. Returns 0 if it is allowed, otherwise
+        the seconds to wait."""
+        retry_after = await self.sliding_window_script(
+            keys=[self.get_key(name)],
+            args=[window * 1000, limit, secrets.token_hex(8)],
+        )
+        return math.ceil(int(retry_after) / 1000)
+
+    async def cooldown(self, name: str, seconds: int) -> int:
+        """Allows one call per interval. Returns 0 if it is allowed,
+        otherwise the seconds to wait."""
+        key = self.get_key(name)
+        if await self.redis.set(key, 1, nx=True, ex=seconds):
+            return 0
+        return max(1, await self.redis.ttl(key))
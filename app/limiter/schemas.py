@@ -0,0 +1,6 @@
+from app.schemas import BackendBase
+
+
+class RateLimitPolicy(BackendBase):
+    limit: int
+    window: int  # seconds
@@ -1,33 +1,37 @@
-import smtplib
+import logging
 from email.message import Message
 from typing import Any
 
-from app.config import settings
+from app.mail.pool import SMTPPool
 from app.mail.schemas import MailMessage
 from app.users.schemas import UserRead
 
+logger = logging.getLogger(__name__)
+
 
 class MailClient:
-    client: smtplib.SMTP_SSL
+    pool: SMTPPool | None
+
+    def __init__(self, pool: SMTPPool | None) -> None:
+        # No pool when mail is disabled
+        self.pool = pool
 
-    def __init__(self) -> None:
-        if not settings.mail.mail_enabled:
+    async def send_msg(self, *messages: Message) -> None:
+        if self.pool is None:
+            logger.info(
+                "Mail is disabled, dropped %d message(s)", len(messages)
+            )
             return
-        self.client = smtplib.SMTP_SSL(
-            settings.mail.smtp_host, settings.mail.smtp_port
-        )
-        self.client.login(
-            settings.mail.smtp_username, settings.mail.smtp_password
-        )
-
-    def send_msg(self, message: Message) -> None:
-        with self.client as session:
-            session.send_message(message)
-
-    def send(
+        await self.pool.send(*messages)
+
+    async def send(
         self, user: UserRead, subject: str, template: str, **kwargs: Any
     ) -> None:
         msg = MailMessage(
             subject=subject, template=template, user=user
         ).as_email(**kwargs)
-        return self.send_msg(msg)
+        await self.send_msg(msg)
+
+    async def close(self) -> None:
+        if self.pool is not None:
+            await self.pool.close()
@@ -8,3 +8,10 @@ class MailSettings(BackendSettings):
     smtp_username: str = ""
     smtp_password: str = ""
     smtp_from_name: str = "FastAPI"
+    smtp_pool_size: int = 4
+    smtp_timeout: int = 10
+    # Idle connections are checked with NOOP after smtp_noop_after seconds
+    # and closed after smtp_idle_timeout
+    smtp_noop_after: int = 10
+    smtp_idle_timeout: int = 60
+    smtp_max_messages: int = 100  # per connection
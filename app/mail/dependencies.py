@@ -2,11 +2,35 @@ from typing import Annotated
 
 from fastapi import Depends
 
+from app.config import settings
 from app.mail.client import MailClient
+from app.mail.pool import SMTPPool
+from app.providers import Provider
+
+mail_client = MailClient(
+    SMTPPool(
+        settings.mail.smtp_host,
+        settings.mail.smtp_port,
+        settings.mail.smtp_username,
+        settings.mail.smtp_password,
+        size=settings.mail.smtp_pool_size,
+        timeout=settings.mail.smtp_timeout,
+        idle_timeout=settings.mail.smtp_idle_timeout,
+        noop_after=settings.mail.smtp_noop_after,
+        max_messages=settings.mail.smtp_max_messages,
+    )
+    if settings.mail.mail_enabled
+    else None
+)
 
 
 def get_mail() -> MailClient:
-    return MailClient()
+    return mail_client
+
+
+def get_mail_provider() -> Provider[MailClient]:
+    return Provider(get_mail)
 
 
 MailDep = Annotated[MailClient, Depends(get_mail)]
+MailProviderDep = Annotated[Provider[MailClient], Depends(get_mail_provider)]
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import smtplib
+import time
+from email.message import Message
+
+from app.obs import panels
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPConnection:
+    smtp: smtplib.SMTP_SSL
+    last_used: float
+    messages: int
+
+    def __init__(self, smtp: smtplib.SMTP_SSL):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+        self.messages = 0
+
+    def send(self, messages: tuple[Message, ...]) -> None:
+        for message in messages:
+            started = time.perf_counter()
+            self.smtp.send_message(message)
+            panels.MAIL_SEND_TIME.observe(time.perf_counter() - started)
+            self.messages += 1
+
+    def is_alive(self) -> bool:
+        try:
+            return self.smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def close(self) -> None:
+        try:
+            self.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self.smtp.close()
+
+
+class SMTPPool:
+    """Authenticated SMTP connections reused across messages.
+
+    smtplib is blocking, every command runs in a thread. Connections idle
+    for noop_after seconds are checked with NOOP before reuse. After
+    idle_timeout seconds, or once they have sent max_messages, they are
+    closed.
+    """
+
+    host: str
+    port: int
+    username: str
+    password: str
+    size: int
+    timeout: float
+    idle_timeout: float
+    noop_after: float
+    max_messages: int
+    idle: list[SMTPConnection]
+    busy: int
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        *,
+        size: int = 4,
+        timeout: float = 10,
+        idle_timeout: float = 60,
+        noop_after: float = 10,
+        max_messages: int = 100,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.noop_after = noop_after
+        self.max_messages = max_messages
+        self.idle = []
+        self.busy = 0
+        self.semaphore = asyncio.Semaphore(size)
+        panels.SMTP_POOL_CONNECTIONS.labels(state="idle").set_function(
+            lambda: len(self.idle)
+        )
+        panels.SMTP_POOL_CONNECTIONS.labels(state="busy").set_function(
+            lambda: self.busy
+        )
+
+    def connect(self) -> SMTPConnection:
+        smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.login(self.username, self.password)
+        except BaseException:
+            smtp.close()
+            raise
+        panels.SMTP_CONNECTIONS_OPENED.inc()
+        return SMTPConnection(smtp)
+
+    async def get_idle(self) -> SMTPConnection | None:
+        # Most recently used first, those are the least likely to be dropped
+        while self.idle:
+            connection = self.idle.pop()
+            idle_for = time.monotonic() - connection.last_used
+            if idle_for < self.noop_after:
+                return connection
+            if idle_for < self.idle_timeout and await asyncio.to_thread(
+                connection.is_alive
+            ):
+                return connection
+            await asyncio.to_thread(connection.close)
+        return None
+
+    async def acquire(self) -> SMTPConnection:
+        await self.semaphore.acquire()
+        try:
+            connection = await self.get_idle()
+            if connection is None:
+                connection = await asyncio.to_thread(self.connect)
+        except BaseException:
+            self.semaphore.release()
+            raise
+        self.busy += 1
+        return connection
+
+    async def release(
+        self, connection: SMTPConnection, *, broken: bool = False
+    ) -> None:
+        self.busy -= 1
+        try:
+            if broken or connection.messages >= self.max_messages:
+                await asyncio.to_thread(connection.close)
+            else:
+                connection.last_used = time.monotonic()
+                self.idle.append(connection)
+        finally:
+            self.semaphore.release()
+
+    async def send(self, *messages: Message) -> None:
+        """Sends the messages over one connection, reconnecting once if
+        the server has dropped it."""
+        connection = await self.acquire()
+        broken = True
+        try:
+            sent = connection.messages
+            try:
+                await asyncio.to_thread(connection.send, messages)
+            except (smtplib.SMTPServerDisconnected, OSError):
+                remaining = messages[connection.messages - sent :]
+                await asyncio.to_thread(connection.close)
+                connection = await asyncio.to_thread(self.connect)
+                await asyncio.to_thread(connection.send, remaining)
+            broken = False
+        except Exception:
+            panels.MAIL_SENT.labels(status="failed").inc(len(messages))
+            raise
+        finally:
+            await self.release(connection, broken=broken)
+        panels.MAIL_SENT.labels(status="sent").inc(len(messages))
+
+    async def close(self) -> None:
+        idle, self.idle = self.idle, []
+        for connection in idle:
+            await asyncio.to_thread(connection.close)
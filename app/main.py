@@ -8,9 +8,16 @@ from app.cache.lifespan import ping_redis
 from app.config import settings
 from app.cors import setup_cors
 from app.exc_handlers import setup_exceptions
+from app.mail.dependencies import mail_client
 from app.obs.setup import setup_obs
+from app.outbox.channels import outbox_dispatcher
 from app.routing import main_router
+from app.telegram.dependencies import close_bot
+from app.users.cache import user_cache
+from app.users.emails import email_filter
+from app.users.hashing import password_hasher
 from app.users.lifespan import register_default_users
+from app.users.revocation import revocation_list
 
 
 @asynccontextmanager
@@ -18,9 +25,20 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup tasks
     await register_default_users()
     await ping_redis()
+    await revocation_list.start()
+    user_cache.start()
+    if settings.auth.email_filter_enabled:
+        await email_filter.start()
+    outbox_dispatcher.start()
     yield
     # Shutdown tasks
-    # ...
+    await outbox_dispatcher.stop()
+    await revocation_list.stop()
+    await user_cache.stop()
+    await email_filter.stop()
+    password_hasher.shutdown()
+    await close_bot()
+    await mail_client.close()
 
 
 app = FastAPI(
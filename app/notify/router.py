@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from starlette import status
 
+from app.config import settings
+from app.limiter.dependencies import RateLimit, by_user
 from app.schemas import BackendOK, backend_ok
 from app.users.dependencies import UserServiceDep, UserDep
 from app.users.schemas import NotifyVia, VerifyToken
@@ -8,7 +10,15 @@ from app.users.schemas import NotifyVia, VerifyToken
 router = APIRouter(prefix="/notify", tags=["Notifications"])
 
 
-@router.post("/code", status_code=status.HTTP_200_OK)
+@router.post(
+    "/code",
+    status_code=status.HTTP_200_OK,
+    dependencies=[
+        Depends(
+            RateLimit("code:user", settings.limiter.limiter_code_user, by_user)
+        )
+    ],
+)
 async def send_code(
     service: UserServiceDep,
     user: UserDep,
@@ -32,5 +32,7 @@ class TelegramSettings(BackendSettings):
     sso: bool = False
     bot_token: str = ""
     auth_expire: int = 5 * 60
+    # Connections shared by all requests of the worker
+    bot_connection_limit: int = 100
 
     model_config = SettingsConfigDict(env_prefix="telegram_")
@@ -1,6 +1,7 @@
 from enum import StrEnum, auto
 from typing import Annotated, assert_never
 
+from aiogram import Bot
 from fastapi import Depends
 from starlette import status
 from starlette.responses import RedirectResponse
@@ -12,7 +13,8 @@ from app.oauth.interfaces import IOAuth2
 from app.oauth.schemas import AuthorizationURL
 from app.oauth.telegram import TelegramOAuth2
 from app.oauth.yandex import YandexOAuth2
-from app.telegram.dependencies import BotDep
+from app.providers import Provider
+from app.telegram.dependencies import BotProviderDep
 
 
 def get_google_sso() -> IOAuth2:
@@ -29,13 +31,32 @@ def get_yandex_sso() -> IOAuth2:
     )
 
 
-def get_telegram_sso(bot: BotDep) -> TelegramOAuth2:
+def get_telegram_sso(bot: Bot) -> TelegramOAuth2:
     return TelegramOAuth2(bot, auth_expire=settings.telegram.auth_expire)
 
 
-GoogleSSODep = Annotated[IOAuth2, Depends(get_google_sso)]
-YandexSSODep = Annotated[IOAuth2, Depends(get_yandex_sso)]
-TelegramSSODep = Annotated[IOAuth2, Depends(get_telegram_sso)]
+# Clients keep the state and PKCE pair of one login, a new one per request
+def get_google_sso_provider() -> Provider[IOAuth2]:
+    return Provider(get_google_sso)
+
+
+def get_yandex_sso_provider() -> Provider[IOAuth2]:
+    return Provider(get_yandex_sso)
+
+
+def get_telegram_sso_provider(bot: BotProviderDep) -> Provider[IOAuth2]:
+    return Provider(lambda: get_telegram_sso(bot()))
+
+
+GoogleSSOProviderDep = Annotated[
+    Provider[IOAuth2], Depends(get_google_sso_provider)
+]
+YandexSSOProviderDep = Annotated[
+    Provider[IOAuth2], Depends(get_yandex_sso_provider)
+]
+TelegramSSOProviderDep = Annotated[
+    Provider[IOAuth2], Depends(get_telegram_sso_provider)
+]
 
 
 class SSOName(StrEnum):
@@ -28,3 +28,90 @@ REQUESTS_IN_PROGRESS = Gauge(
     "Gauge of requests by method and path currently being processed",
     ["method", "path", "app_name"],
 )
+TOKEN_CACHE_HITS = Counter(
+    "auth_token_cache_hits_total",
+    "Total count of tokens served from the verified token cache.",
+    ["token_type"],
+)
+TOKEN_CACHE_MISSES = Counter(
+    "auth_token_cache_misses_total",
+    "Total count of tokens verified by signature check.",
+    ["token_type"],
+)
+PASSWORD_HASHER_PENDING = Gauge(
+    "auth_password_hasher_pending",
+    "Gauge of password operations queued or running in the process pool.",
+)
+PASSWORD_HASHER_WAIT_TIME = Histogram(
+    "auth_password_hasher_wait_seconds",
+    "Histogram of time password operations wait for a pool process "
+    "(in seconds)",
+    ["operation"],
+)
+PASSWORD_HASHER_REJECTED = Counter(
+    "auth_password_hasher_rejected_total",
+    "Total count of password operations rejected because the queue was full.",
+    ["operation"],
+)
+RATE_LIMITED = Counter(
+    "auth_rate_limited_total",
+    "Total count of requests rejected by rate limit policy.",
+    ["policy"],
+)
+USER_CACHE_HITS = Counter(
+    "auth_user_cache_hits_total",
+    "Total count of user lookups served from the cache by layer.",
+    ["layer"],
+)
+USER_CACHE_MISSES = Counter(
+    "auth_user_cache_misses_total",
+    "Total count of user lookups that reached the database.",
+)
+BLOOM_FILTER_ITEMS = Gauge(
+    "auth_bloom_filter_items",
+    "Gauge of items added to the Bloom filter since it was loaded.",
+    ["filter"],
+)
+BLOOM_FILTER_BYTES = Gauge(
+    "auth_bloom_filter_bytes",
+    "Gauge of memory used by the Bloom filter bit array (in bytes).",
+    ["filter"],
+)
+BLOOM_FILTER_ERROR_RATE = Gauge(
+    "auth_bloom_filter_error_rate",
+    "Gauge of the estimated false positive rate of the Bloom filter.",
+    ["filter"],
+)
+EMAIL_FILTER_SKIPPED = Counter(
+    "auth_email_filter_skipped_total",
+    "Total count of email lookups answered by the Bloom filter "
+    "without a query.",
+)
+MAIL_SEND_TIME = Histogram(
+    "auth_mail_send_seconds",
+    "Histogram of time to send one message over SMTP (in seconds)",
+)
+MAIL_SENT = Counter(
+    "auth_mail_sent_total",
+    "Total count of mail messages by delivery status.",
+    ["status"],
+)
+SMTP_POOL_CONNECTIONS = Gauge(
+    "auth_smtp_pool_connections",
+    "Gauge of pooled SMTP connections by state.",
+    ["state"],
+)
+SMTP_CONNECTIONS_OPENED = Counter(
+    "auth_smtp_connections_opened_total",
+    "Total count of SMTP connections opened and authenticated.",
+)
+OUTBOX_DELIVERED = Counter(
+    "auth_outbox_delivered_total",
+    "Total count of outbox delivery attempts by channel and status.",
+    ["channel", "status"],
+)
+OUTBOX_DELIVERY_TIME = Histogram(
+    "auth_outbox_delivery_seconds",
+    "Histogram of time to deliver one outbox message (in seconds)",
+    ["channel"],
+)
@@ -0,0 +1,54 @@
+from typing import Any
+
+from app.cache.dependencies import cache
+from app.config import settings
+from app.db.connection import async_session_factory
+from app.db.types import ID
+from app.mail.dependencies import mail_client
+from app.mail.schemas import MailMessage
+from app.outbox.dispatcher import OutboxDispatcher
+from app.outbox.schemas import OutboxChannel
+from app.telegram.dependencies import bot_provider
+from app.users.codes import get_code_engine
+from app.users.schemas import UserRead
+
+
+async def render_code(payload: dict[str, Any]) -> dict[str, str]:
+    # Created on delivery, so codes are never stored in the outbox
+    if payload.get("code_for") is None:
+        return {}
+    engine = get_code_engine(cache)
+    code = await engine.create(
+        ID(payload["code_for"]), payload.get("code_ref")
+    )
+    return {"code": code}
+
+
+async def deliver_mail(payload: dict[str, Any]) -> None:
+    msg = MailMessage(
+        subject=payload["subject"],
+        template=payload["template"],
+        user=UserRead.model_validate(payload["user"]),
+    ).as_email(**payload["context"], **await render_code(payload))
+    await mail_client.send_msg(msg)
+
+
+async def deliver_telegram(payload: dict[str, Any]) -> None:
+    text = payload["text"]
+    if code := await render_code(payload):
+        text = text.format(**code)
+    await bot_provider().send_message(payload["chat_id"], text)
+
+
+outbox_dispatcher = OutboxDispatcher(
+    async_session_factory,
+    {
+        OutboxChannel.mail: deliver_mail,
+        OutboxChannel.telegram: deliver_telegram,
+    },
+    batch_size=settings.outbox.outbox_batch_size,
+    poll_interval=settings.outbox.outbox_poll_interval,
+    max_attempts=settings.outbox.outbox_max_attempts,
+    backoff_base=settings.outbox.outbox_backoff_base,
+    backoff_max=settings.outbox.outbox_backoff_max,
+)
@@ -0,0 +1,10 @@
+from app.schemas import BackendSettings
+
+
+class OutboxSettings(BackendSettings):
+    outbox_batch_size: int = 50
+    # Dispatchers are also woken up by commits of their own worker
+    outbox_poll_interval: float = 5.0
+    outbox_max_attempts: int = 10
+    outbox_backoff_base: float = 2.0  # seconds, doubled on every attempt
+    outbox_backoff_max: float = 60 * 60
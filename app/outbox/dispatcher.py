@@ -0,0 +1,136 @@
+import asyncio
+import datetime
+import logging
+import random
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.uow import UOW
+from app.db.utils import naive_utc
+from app.obs import panels
+from app.outbox.schemas import OutboxChannel, OutboxRead
+
+logger = logging.getLogger(__name__)
+
+type Handler = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class OutboxDispatcher:
+    """Delivers messages written to the outbox table.
+
+    Messages are committed together with the change that produced them.
+    Every worker runs a dispatcher: batches are claimed with FOR UPDATE
+    SKIP LOCKED, so each message goes to one dispatcher at a time. Failed
+    deliveries are retried with exponential backoff until max_attempts,
+    then kept in the table for inspection.
+    """
+
+    handlers: dict[OutboxChannel, Handler]
+    batch_size: int
+    poll_interval: float
+    max_attempts: int
+    backoff_base: float
+    backoff_max: float
+    task: asyncio.Task[None] | None
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        handlers: dict[OutboxChannel, Handler],
+        *,
+        batch_size: int = 50,
+        poll_interval: float = 5.0,
+        max_attempts: int = 10,
+        backoff_base: float = 2.0,
+        backoff_max: float = 60 * 60,
+    ):
+        self.session_factory = session_factory
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    async def wake(self) -> None:
+        self.wakeup.set()
+
+    def get_backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2**attempts)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def deliver(self, message: OutboxRead) -> None:
+        started = asyncio.get_running_loop().time()
+        await self.handlers[message.channel](message.payload)
+        panels.OUTBOX_DELIVERY_TIME.labels(channel=message.channel).observe(
+            asyncio.get_running_loop().time() - started
+        )
+
+    async def dispatch(self) -> int:
+        """Delivers one batch, returns the number of claimed messages."""
+        async with UOW(self.session_factory) as uow:
+            messages = await uow.outbox.claim(
+                self.batch_size, self.max_attempts
+            )
+            results = await asyncio.gather(
+                *(self.deliver(message) for message in messages),
+                return_exceptions=True,
+            )
+            delivered = []
+            for message, result in zip(messages, results):
+                if not isinstance(result, Exception):
+                    delivered.append(message.id)
+                    panels.OUTBOX_DELIVERED.labels(
+                        channel=message.channel, status="sent"
+                    ).inc()
+                    continue
+                failed = message.attempts + 1 >= self.max_attempts
+                panels.OUTBOX_DELIVERED.labels(
+                    channel=message.channel,
+                    status="failed" if failed else "retried",
+                ).inc()
+                logger.warning(
+                    "Failed to deliver %s message %s (attempt %d)",
+                    message.channel,
+                    message.id,
+                    message.attempts + 1,
+                    exc_info=result,
+                )
+                available_at = naive_utc() + datetime.timedelta(
+                    seconds=self.get_backoff(message.attempts)
+                )
+                await uow.outbox.retry(message.id, available_at, repr(result))
+            await uow.outbox.complete(delivered)
+        return len(messages)
+
+    async def run(self) -> None:
+        while True:
+            self.wakeup.clear()
+            try:
+                claimed = await self.dispatch()
+            except Exception:
+                logger.exception("Outbox dispatch failed")
+                claimed = 0
+            if claimed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
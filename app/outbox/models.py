@@ -0,0 +1,21 @@
+import datetime
+from typing import Any
+
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import utils
+from app.db.base import BaseOrm
+from app.db.mixins import IDMixin, TimestampMixin
+
+
+class OutboxOrm(BaseOrm, IDMixin, TimestampMixin):
+    __tablename__ = "outbox"
+
+    channel: Mapped[str]
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB)
+    attempts: Mapped[int] = mapped_column(default=0)
+    available_at: Mapped[datetime.datetime] = mapped_column(
+        default=utils.naive_utc, index=True
+    )
+    last_error: Mapped[str | None]
@@ -0,0 +1,61 @@
+import datetime
+from typing import Any
+
+from sqlalchemy import delete, select, update
+
+from app.db.repository import AlchemyRepository
+from app.db.types import ID
+from app.db.utils import naive_utc
+from app.outbox.models import OutboxOrm
+from app.outbox.schemas import OutboxRead, OutboxChannel
+
+
+class OutboxRepository(AlchemyRepository[OutboxOrm, OutboxRead]):
+    model_type = OutboxOrm
+    schema_type = OutboxRead
+
+    async def add(
+        self, channel: OutboxChannel, payload: dict[str, Any]
+    ) -> OutboxRead:
+        return await self.create(channel=channel, payload=payload)
+
+    async def claim(self, limit: int, max_attempts: int) -> list[OutboxRead]:
+        """Locks due messages until the end of the transaction. Messages
+        locked by other dispatchers are skipped."""
+        stmt = (
+            select(OutboxOrm)
+            .where(
+                (OutboxOrm.available_at <= naive_utc())  # noqa
+                & (OutboxOrm.attempts < max_attempts)
+            )
+            .order_by(OutboxOrm.available_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.scalars(stmt)
+        return [OutboxRead.model_validate(message) for message in result]
+
+    async def complete(self, idents: list[ID]) -> None:
+        if not idents:
+            return
+        stmt = (
+            delete(OutboxOrm)
+            .where(OutboxOrm.id.in_(idents))
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
+
+    async def retry(
+        self, ident: ID, available_at: datetime.datetime, error: str
+    ) -> None:
+        stmt = (
+            update(OutboxOrm)
+            .where(OutboxOrm.id == ident)  # noqa
+            .values(
+                attempts=OutboxOrm.attempts + 1,
+                available_at=available_at,
+                last_error=error,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
@@ -0,0 +1,18 @@
+import datetime
+from enum import StrEnum, auto
+from typing import Any
+
+from app.db.schemas import IDModel, TimestampModel
+
+
+class OutboxChannel(StrEnum):
+    mail = auto()
+    telegram = auto()
+
+
+class OutboxRead(IDModel, TimestampModel):
+    channel: OutboxChannel
+    payload: dict[str, Any]
+    attempts: int
+    available_at: datetime.datetime
+    last_error: str | None = None
@@ -0,0 +1,9 @@
+from app.schemas import BackendSettings
+
+
+class PersonalTokenSettings(BackendSettings):
+    # HMAC key of token digests, derived from the JWT private key by default
+    pat_secret: str | None = None
+    pat_prefix_length: int = 12
+    # Minimum interval between two writes of last_used_at
+    pat_touch_interval: int = 60
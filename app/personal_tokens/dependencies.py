@@ -0,0 +1,16 @@
+from typing import Annotated
+
+from fastapi import Depends
+
+from app.db.types import ID
+from app.personal_tokens.schemas import PersonalTokenRead
+from app.personal_tokens.service import PersonalTokenService
+from app.users.dependencies import UserDep
+
+PersonalTokenServiceDep = Annotated[PersonalTokenService, Depends()]
+
+
+async def get_personal_token(
+    service: PersonalTokenServiceDep, user: UserDep, token_id: ID
+) -> PersonalTokenRead:
+    return await service.get_one(user, token_id)
@@ -0,0 +1,21 @@
+from starlette import status
+
+from app.exceptions import BackendError
+from app.users.exceptions import Unauthorized
+
+
+class PersonalTokenNotFound(BackendError):
+    message = "Personal access token with this id not found"
+    error_code = "personal_token_not_found"
+    status_code = status.HTTP_404_NOT_FOUND
+
+
+class PersonalTokenExpired(Unauthorized):
+    message = "Personal access token has expired"
+    error_code = "personal_token_expired"
+
+
+class InsufficientScope(BackendError):
+    message = "Personal access token lacks the required scope"
+    error_code = "insufficient_scope"
+    status_code = status.HTTP_403_FORBIDDEN
@@ -0,0 +1,21 @@
+import datetime
+from uuid import UUID
+
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import BaseOrm
+from app.db.mixins import IDMixin, TimestampMixin
+
+
+class PersonalTokenOrm(BaseOrm, IDMixin, TimestampMixin):
+    __tablename__ = "personal_tokens"
+
+    user_id: Mapped[UUID] = mapped_column(index=True)
+    name: Mapped[str]
+    prefix: Mapped[str] = mapped_column(index=True, unique=True)
+    digest: Mapped[str]
+    scopes: Mapped[list[str]] = mapped_column(ARRAY(String))
+    expires_at: Mapped[datetime.datetime | None]
+    last_used_at: Mapped[datetime.datetime | None]
@@ -0,0 +1,54 @@
+import datetime
+
+from sqlalchemy import select, update
+
+from app.db.repository import AlchemyRepository
+from app.db.schemas import PageParams, Page
+from app.db.types import ID
+from app.personal_tokens.models import PersonalTokenOrm
+from app.personal_tokens.schemas import PersonalTokenRead
+from app.users.models import UserOrm
+from app.users.schemas import UserRead
+
+
+class PersonalTokenRepository(
+    AlchemyRepository[PersonalTokenOrm, PersonalTokenRead]
+):
+    model_type = PersonalTokenOrm
+    schema_type = PersonalTokenRead
+
+    async def get_with_user(
+        self, prefix: str
+    ) -> tuple[PersonalTokenRead, UserRead] | None:
+        stmt = (
+            select(PersonalTokenOrm, UserOrm)
+            .join(UserOrm, UserOrm.id == PersonalTokenOrm.user_id)  # noqa
+            .where(PersonalTokenOrm.prefix == prefix)  # noqa
+        )
+        row = (await self.session.execute(stmt)).one_or_none()
+        if row is None:
+            return None
+        token, user = row
+        return (
+            PersonalTokenRead.model_validate(token),
+            UserRead.model_validate(user),
+        )
+
+    async def touch(self, ident: ID, last_used_at: datetime.datetime) -> None:
+        stmt = (
+            update(PersonalTokenOrm)
+            .where(PersonalTokenOrm.id == ident)  # noqa
+            .values(last_used_at=last_used_at)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
+
+    async def paginate_by_user(
+        self, user_id: ID, params: PageParams
+    ) -> Page[PersonalTokenRead]:
+        stmt = select(PersonalTokenOrm).where(
+            PersonalTokenOrm.user_id == user_id  # noqa
+        )
+        stmt = self.build_pagination_query(params, stmt)
+        result = await self.session.scalars(stmt)
+        return self.validate_page(result)
@@ -0,0 +1,52 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from starlette import status
+
+from app.db.schemas import PageParams, Page
+from app.personal_tokens.dependencies import (
+    PersonalTokenServiceDep,
+    get_personal_token,
+)
+from app.personal_tokens.schemas import (
+    PersonalTokenCreate,
+    PersonalTokenCreated,
+    PersonalTokenRead,
+)
+from app.users.dependencies import UserDep, ScopesDep
+
+router = APIRouter(prefix="/personal-tokens", tags=["Personal tokens"])
+
+
+@router.post("/", status_code=status.HTTP_201_CREATED)
+async def create(
+    service: PersonalTokenServiceDep,
+    user: UserDep,
+    scopes: ScopesDep,
+    data: PersonalTokenCreate,
+) -> PersonalTokenCreated:
+    return await service.create(user, data, scopes)
+
+
+@router.get("/{token_id}", status_code=status.HTTP_200_OK)
+async def get(
+    token: Annotated[PersonalTokenRead, Depends(get_personal_token)],
+) -> PersonalTokenRead:
+    return token
+
+
+@router.delete("/{token_id}", status_code=status.HTTP_200_OK)
+async def delete(
+    service: PersonalTokenServiceDep,
+    token: Annotated[PersonalTokenRead, Depends(get_personal_token)],
+) -> PersonalTokenRead:
+    return await service.delete(token)
+
+
+@router.get("/", status_code=status.HTTP_200_OK)
+async def paginate(
+    service: PersonalTokenServiceDep,
+    user: UserDep,
+    params: Annotated[PageParams, Depends()],
+) -> Page[PersonalTokenRead]:
+    return await service.paginate(user, params)
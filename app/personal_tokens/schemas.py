@@ -0,0 +1,39 @@
+import datetime
+from enum import StrEnum, auto
+
+from pydantic import Field
+
+from app.db.schemas import IDModel, TimestampModel
+from app.db.types import ID
+from app.schemas import BackendBase
+
+
+class TokenScope(StrEnum):
+    read = auto()
+    write = auto()
+    admin = auto()
+    introspect = auto()
+
+
+class PersonalTokenBase(BackendBase):
+    name: str = Field(max_length=255)
+    scopes: list[TokenScope] = [TokenScope.read]
+
+
+class PersonalTokenCreate(PersonalTokenBase):
+    expires_in: int | None = Field(
+        None, gt=0
+    )  # seconds, never expires if None
+
+
+class PersonalTokenRead(PersonalTokenBase, IDModel, TimestampModel):
+    user_id: ID
+    prefix: str
+    digest: str = Field(exclude=True)
+    expires_at: datetime.datetime | None = None
+    last_used_at: datetime.datetime | None = None
+
+
+class PersonalTokenCreated(PersonalTokenRead):
+    # Only returned once, on creation
+    token: str
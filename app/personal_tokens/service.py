@@ -0,0 +1,89 @@
+import datetime
+import hmac
+
+from app.config import settings
+from app.db.schemas import PageParams, Page
+from app.db.types import ID
+from app.db.utils import naive_utc
+from app.personal_tokens.exceptions import (
+    PersonalTokenNotFound,
+    PersonalTokenExpired,
+    InsufficientScope,
+)
+from app.personal_tokens.schemas import (
+    PersonalTokenCreate,
+    PersonalTokenCreated,
+    PersonalTokenRead,
+    TokenScope,
+)
+from app.personal_tokens.tokens import generate_token, get_digest, parse_token
+from app.service import Service
+from app.users.exceptions import InvalidToken
+from app.users.schemas import UserRead
+
+
+class PersonalTokenService(Service):
+    async def create(
+        self,
+        user: UserRead,
+        data: PersonalTokenCreate,
+        scopes: set[TokenScope] | None = None,
+    ) -> PersonalTokenCreated:
+        # A personal token can't grant more than the credential creating it
+        if scopes is not None and not set(data.scopes) <= scopes:
+            raise InsufficientScope()
+        token, prefix, secret = generate_token()
+        expires_at = (
+            naive_utc() + datetime.timedelta(seconds=data.expires_in)
+            if data.expires_in
+            else None
+        )
+        created = await self.uow.personal_tokens.create(
+            user_id=user.id,
+            name=data.name,
+            prefix=prefix,
+            digest=get_digest(secret),
+            scopes=sorted(set(data.scopes)),
+            expires_at=expires_at,
+        )
+        return PersonalTokenCreated(
+            **created.model_dump(), digest=created.digest, token=token
+        )
+
+    async def get_one(self, user: UserRead, token_id: ID) -> PersonalTokenRead:
+        token = await self.uow.personal_tokens.get(token_id)
+        if not token or token.user_id != user.id:
+            raise PersonalTokenNotFound()
+        return token
+
+    async def paginate(
+        self, user: UserRead, params: PageParams
+    ) -> Page[PersonalTokenRead]:
+        return await self.uow.personal_tokens.paginate_by_user(user.id, params)
+
+    async def delete(self, token: PersonalTokenRead) -> PersonalTokenRead:
+        return await self.uow.personal_tokens.delete(token.id)
+
+    async def authenticate(
+        self, token: str
+    ) -> tuple[UserRead, set[TokenScope]]:
+        parsed = parse_token(token)
+        if parsed is None:
+            raise InvalidToken()
+        prefix, secret = parsed
+        found = await self.uow.personal_tokens.get_with_user(prefix)
+        if found is None:
+            raise InvalidToken()
+        personal_token, user = found
+        if not hmac.compare_digest(get_digest(secret), personal_token.digest):
+            raise InvalidToken()
+        now = naive_utc()
+        if personal_token.expires_at and personal_token.expires_at <= now:
+            raise PersonalTokenExpired()
+        if (
+            personal_token.last_used_at is None
+            or (now - personal_token.last_used_at).total_seconds()
+            >= settings.pat.pat_touch_interval
+        ):
+            await self.uow.personal_tokens.touch(personal_token.id, now)
+        return user, set(personal_token.scopes)
@@ -0,0 +1,48 @@
+import functools
+import hashlib
+import hmac
+import secrets
+
+from app.config import settings
+
+PREFIX = "pat_"
+
+
+@functools.cache
+def get_digest_key() -> bytes:
+    if settings.pat.pat_secret:
+        return settings.pat.pat_secret.encode()
+    return hmac.digest(
+        settings.auth.jwt_private_key.read_bytes(),
+        b"personal_tokens",
+        "sha256",
+    )
+
+
+def is_personal_token(token: str) -> bool:
+    return token.startswith(PREFIX)
+
+
+def generate_token() -> tuple[str, str, str]:
+    """Returns (token, lookup prefix, secret)."""
+    prefix = secrets.token_hex(settings.pat.pat_prefix_length // 2)
+    secret = secrets.token_urlsafe(32)
+    return f"{PREFIX}{prefix}_{secret}", prefix, secret
+
+
+def parse_token(token: str) -> tuple[str, str] | None:
+    """Splits a token into (lookup prefix, secret)."""
+    if not is_personal_token(token):
+        return None
+    prefix, _, secret = token[len(PREFIX) :].partition("_")
+    if not prefix or not secret:
+        return None
+    return prefix, secret
+
+
+def get_digest(secret: str) -> str:
+    # The secret has 256 bits of entropy: a keyed hash is enough, no need
+    # for a slow password hash
+    return hmac.new(
+        get_digest_key(), secret.encode(), hashlib.sha256
+    ).hexdigest()
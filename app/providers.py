@@ -0,0 +1,21 @@
+from typing import Callable
+
+
+class Provider[T]:
+    """Creates a dependency on first use and returns the same one after."""
+
+    factory: Callable[[], T]
+    instance: T | None
+
+    def __init__(self, factory: Callable[[], T]):
+        self.factory = factory
+        self.instance = None
+
+    @property
+    def created(self) -> bool:
+        return self.instance is not None
+
+    def __call__(self) -> T:
+        if self.instance is None:
+            self.instance = self.factory()
+        return self.instance
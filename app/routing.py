@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends
 from starlette import status
 
 from app.notify.router import router as notify_router
+from app.personal_tokens.router import router as personal_tokens_router
 from app.schemas import BackendErrorResponse
 from app.sso.router import router as sso_router
 from app.sso_accounts.router import router as sso_accounts_router
@@ -11,12 +12,14 @@ from app.users.admin_router import router as admin_router
 from app.users.auth_router import (
     auth_router,
 )
+from app.users.jwks_router import router as jwks_router
 from app.users.dependencies import get_user
 from app.users.user_router import router as user_router
 
 unprotected_router = APIRouter()
 unprotected_router.include_router(auth_router)
 unprotected_router.include_router(sso_router)
+unprotected_router.include_router(jwks_router)
 
 protected_router = APIRouter(dependencies=[Depends(get_user)])
 
@@ -24,6 +27,7 @@ protected_router.include_router(notify_router)
 protected_router.include_router(user_router)
 protected_router.include_router(admin_router)
 protected_router.include_router(sso_accounts_router)
+protected_router.include_router(personal_tokens_router)
 
 main_router = APIRouter(
     responses={
@@ -31,6 +35,7 @@ main_router = APIRouter(
         status.HTTP_401_UNAUTHORIZED: {"model": BackendErrorResponse},
         status.HTTP_403_FORBIDDEN: {"model": BackendErrorResponse},
         status.HTTP_404_NOT_FOUND: {"model": BackendErrorResponse},
+        status.HTTP_409_CONFLICT: {"model": BackendErrorResponse},
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": BackendErrorResponse},
     },
 )
@@ -0,0 +1,9 @@
+from starlette import status
+
+from app.exceptions import BackendError
+
+
+class HasherBusy(BackendError):
+    message = "Too many password operations in progress, try again later"
+    error_code = "hasher_busy"
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
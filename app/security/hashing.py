@@ -1,3 +1,206 @@
+import asyncio
+import functools
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
 from passlib.context import CryptContext
+from passlib.hash import argon2
+
+from app.obs import panels
+from app.security.exceptions import HasherBusy
+
+
+def make_context(
+    *, time_cost: int = 3, memory_cost: int = 64 * 1024, parallelism: int = 4
+) -> CryptContext:
+    # New hashes are Argon2id, bcrypt hashes are upgraded on login
+    return CryptContext(
+        schemes=["argon2", "bcrypt"],
+        deprecated="auto",
+        argon2__type="ID",
+        argon2__time_cost=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism,
+    )
+
+
+# The functions below run in the pool processes, which rebuild
+# the context from its serialized config once
+@functools.cache
+def load_context(config: str) -> CryptContext:
+    return CryptContext.from_string(config)
+
+
+def hash_password(config: str, secret: str) -> str:
+    return load_context(config).hash(secret)
+
+
+def verify_password(config: str, secret: str, hashed: str | None) -> bool:
+    return load_context(config).verify(secret, hashed)
+
+
+def needs_rehash(context: CryptContext, hashed: str) -> bool:
+    # Unlike CryptContext.needs_update, a hash with a different but not
+    # weaker Argon2 cost is kept, so it doesn't change on every login
+    if context.identify(hashed) != "argon2":
+        return True
+    current = context.handler("argon2")
+    stored = argon2.from_string(hashed)
+    return bool(
+        stored.type != current.type
+        or stored.rounds < current.default_rounds
+        or stored.memory_cost < current.memory_cost
+    )
+
+
+def verify_and_update(
+    config: str, secret: str, hashed: str | None
+) -> tuple[bool, str | None]:
+    context = load_context(config)
+    if not context.verify(secret, hashed):
+        return False, None
+    assert hashed is not None
+    if needs_rehash(context, hashed):
+        return True, context.hash(secret)
+    return True, None
+
+
+def measure_argon2(
+    time_cost: int, memory_cost: int, parallelism: int, *, rounds: int = 3
+) -> float:
+    handler = argon2.using(
+        type="ID",
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+    )
+    hashed = handler.hash("calibration")
+    elapsed = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        handler.verify("calibration", hashed)
+        elapsed = min(elapsed, time.perf_counter() - started)
+    return elapsed
+
+
+def calibrate_argon2(
+    target: float,
+    *,
+    parallelism: int,
+    max_memory_cost: int,
+    min_memory_cost: int = 19 * 1024,
+    max_time_cost: int = 10,
+) -> tuple[int, int]:
+    """Picks (time_cost, memory_cost) for a verify time close to target.
+
+    Memory is halved until one pass fits the target, then passes are added.
+    """
+    memory_cost = max_memory_cost
+    elapsed = measure_argon2(1, memory_cost, parallelism)
+    while elapsed > target and memory_cost > min_memory_cost:
+        memory_cost = max(min_memory_cost, memory_cost // 2)
+        elapsed = measure_argon2(1, memory_cost, parallelism)
+    time_cost = max(1, min(max_time_cost, round(target / elapsed)))
+    return time_cost, memory_cost
+
+
+def run_timed(func: Callable[..., Any], *args: Any) -> tuple[float, Any]:
+    return time.time(), func(*args)
+
+
+class PasswordHasher:
+    """Runs the context in a process pool, so hashing doesn't block the
+    event loop.
+
+    At most max_pending operations are queued or running, the rest are
+    rejected with HasherBusy instead of waiting.
+    """
+
+    context: CryptContext
+    max_workers: int | None
+    max_pending: int
+    retry_after: int
+    pending: int
+
+    def __init__(
+        self,
+        context: CryptContext,
+        *,
+        max_workers: int | None = None,
+        max_pending: int = 32,
+        retry_after: int = 1,
+    ):
+        self.configure(context)
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.pending = 0
+        self.executor: ProcessPoolExecutor | None = None
+
+    def configure(self, context: CryptContext) -> None:
+        # Pool processes load the new config on their next call
+        self.context = context
+        self.config = context.to_string()
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            # Forking a process with running threads is unsafe
+            self.executor = ProcessPoolExecutor(
+                self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self.executor
+
+    async def run(
+        self, operation: str, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        if self.pending >= self.max_pending:
+            panels.PASSWORD_HASHER_REJECTED.labels(operation=operation).inc()
+            raise HasherBusy(headers={"Retry-After": str(self.retry_after)})
+        self.pending += 1
+        panels.PASSWORD_HASHER_PENDING.set(self.pending)
+        submitted = time.time()
+        loop = asyncio.get_running_loop()
+        try:
+            started, result = await loop.run_in_executor(
+                self.get_executor(), run_timed, func, self.config, *args
+            )
+        except BrokenProcessPool:
+            # A worker died, start a new pool on the next call
+            self.executor = None
+            raise
+        finally:
+            self.pending -= 1
+            panels.PASSWORD_HASHER_PENDING.set(self.pending)
+        panels.PASSWORD_HASHER_WAIT_TIME.labels(operation=operation).observe(
+            max(0.0, started - submitted)
+        )
+        return result
+
+    async def hash(self, secret: str) -> str:
+        hashed: str = await self.run("hash", hash_password, secret)
+        return hashed
+
+    async def verify(self, secret: str, hashed: str | None) -> bool:
+        verified: bool = await self.run(
+            "verify", verify_password, secret, hashed
+        )
+        return verified
+
+    async def verify_and_update(
+        self, secret: str, hashed: str | None
+    ) -> tuple[bool, str | None]:
+        """Returns a new hash as well when the hash uses an outdated scheme
+        or a lower cost than configured."""
+        result: tuple[bool, str | None] = await self.run(
+            "verify", verify_and_update, secret, hashed
+        )
+        return result
 
-crypt_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
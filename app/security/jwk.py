@@ -0,0 +1,31 @@
+import base64
+import hashlib
+import json
+from typing import Any
+
+from jwt.algorithms import HMACAlgorithm, get_default_algorithms
+
+JWK = dict[str, Any]
+
+# https://www.rfc-editor.org/rfc/rfc7638#section-3.2
+THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+}
+
+
+def is_symmetric(algorithm: str) -> bool:
+    return isinstance(get_default_algorithms()[algorithm], HMACAlgorithm)
+
+
+def to_jwk(algorithm: str, key: Any) -> JWK:
+    jwk = get_default_algorithms()[algorithm].to_jwk(key, as_dict=True)
+    return dict(jwk)
+
+
+def thumbprint(jwk: JWK) -> str:
+    members = {name: jwk[name] for name in THUMBPRINT_MEMBERS[jwk["kty"]]}
+    canonical = json.dumps(members, separators=(",", ":"), sort_keys=True)
+    digest = hashlib.sha256(canonical.encode()).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
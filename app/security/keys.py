@@ -0,0 +1,40 @@
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+RSA_KEY_SIZES = {"RS256": 2048, "RS384": 3072, "RS512": 4096}
+RSA_KEY_SIZES |= {f"PS{alg[2:]}": size for alg, size in RSA_KEY_SIZES.items()}
+EC_CURVES = {
+    "ES256": ec.SECP256R1,
+    "ES256K": ec.SECP256K1,
+    "ES384": ec.SECP384R1,
+    "ES512": ec.SECP521R1,
+}
+
+
+def generate_private_key(algorithm: str) -> Any:
+    if algorithm in RSA_KEY_SIZES:
+        return rsa.generate_private_key(
+            public_exponent=65537, key_size=RSA_KEY_SIZES[algorithm]
+        )
+    if algorithm in EC_CURVES:
+        return ec.generate_private_key(EC_CURVES[algorithm]())
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"Unsupported asymmetric algorithm: {algorithm}")
+
+
+def generate_key_pair(algorithm: str) -> tuple[str, str]:
+    """Generates a PEM encoded (private, public) key pair for the algorithm."""
+    key = generate_private_key(algorithm)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_pem.decode(), public_pem.decode()
@@ -0,0 +1,54 @@
+import json
+import secrets
+import time
+
+from redis.asyncio import Redis
+
+from app.security.tokens import (
+    Claims,
+    TokenParams,
+    cache_key,
+    get_cached_claims,
+    set_cached_claims,
+)
+
+
+class ReferenceTokenStore:
+    """Opaque tokens: a random reference handed to the client, the claims
+    stored in Redis under its digest."""
+
+    redis: Redis
+    key: str
+
+    def __init__(self, redis: Redis, *, key: str = "fastapi"):
+        self.redis = redis
+        self.key = key
+
+    def get_key(self, digest: bytes) -> str:
+        return f"{self.key}:tokens:{digest.hex()}"
+
+    async def encode(self, claims: Claims) -> str:
+        token = secrets.token_urlsafe(32)
+        expire = max(1, int(claims["exp"] - time.time()))
+        await self.redis.set(
+            self.get_key(cache_key(token)), json.dumps(claims), ex=expire
+        )
+        return token
+
+    async def decode(self, params: TokenParams, token: str) -> Claims | None:
+        digest = cache_key(token)
+        claims = get_cached_claims(params, digest)
+        if claims is not None:
+            return claims
+        value = await self.redis.get(self.get_key(digest))
+        if value is None:
+            return None
+        claims = json.loads(value)
+        set_cached_claims(params, digest, claims)
+        return claims
+
+    async def delete(self, params: TokenParams, token: str) -> None:
+        digest = cache_key(token)
+        if params.cache is not None:
+            params.cache.delete(digest)
+        await self.redis.delete(self.get_key(digest))
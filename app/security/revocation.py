@@ -0,0 +1,64 @@
+from typing import AsyncIterator
+
+from redis.asyncio import Redis
+
+from app.cache.bloom import SharedBloomFilter
+
+
+class RevocationList(SharedBloomFilter):
+    """Revoked token ids (jti).
+
+    Redis is the source of truth: every revoked jti is a key that expires
+    with the token. Each worker mirrors the keys into a local Bloom filter,
+    kept in sync over pub/sub, and only asks Redis when the filter reports
+    a possible hit.
+    """
+
+    redis: Redis
+    key: str
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        key: str = "fastapi",
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        rebuild_interval: int = 60 * 60,
+    ):
+        super().__init__(
+            redis,
+            f"{key}:revoked",
+            name="revocation",
+            capacity=capacity,
+            error_rate=error_rate,
+            rebuild_interval=rebuild_interval,
+        )
+        self.redis = redis
+        self.key = key
+
+    def get_key(self, jti: str) -> str:
+        return f"{self.key}:revoked:{jti}"
+
+    async def revoke(self, jti: str, expire: int) -> bool:
+        """Returns False if the jti was already revoked."""
+        if expire <= 0:
+            return False
+        revoked = await self.redis.set(
+            self.get_key(jti), 1, ex=expire, nx=True
+        )
+        if revoked:
+            await self.publish(jti)
+        return bool(revoked)
+
+    async def is_revoked(self, jti: str) -> bool:
+        # Until the filter is loaded every check goes to Redis
+        if not self.might_contain(jti):
+            return False
+        return bool(await self.redis.exists(self.get_key(jti)))
+
+    async def scan(self) -> AsyncIterator[str]:
+        # Expired tokens are gone from Redis, rebuilding drops them
+        prefix = len(self.get_key(""))
+        async for key in self.redis.scan_iter(self.get_key("*"), count=1000):
+            yield key.decode()[prefix:]
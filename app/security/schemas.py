@@ -0,0 +1,25 @@
+from pydantic import Field
+
+from app.schemas import BackendBase
+
+
+class IntrospectionRequest(BackendBase):
+    tokens: list[str] = Field(min_length=1, max_length=20)
+
+
+# RFC 7662 token introspection response
+class TokenIntrospection(BackendBase):
+    active: bool
+    token_type: str | None = None
+    sub: str | None = None
+    username: str | None = None
+    jti: str | None = None
+    iss: str | None = None
+    aud: list[str] | None = None
+    iat: int | None = None
+    nbf: int | None = None
+    exp: int | None = None
+
+
+class IntrospectionResponse(BackendBase):
+    results: list[TokenIntrospection]
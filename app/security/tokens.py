@@ -1,23 +1,173 @@
 import datetime
+import functools
+import hashlib
+import time
 import uuid
+from enum import StrEnum, auto
 from typing import Any
 
 import jwt
-from pydantic import Field, EmailStr, field_serializer, ConfigDict
+from jwt.algorithms import get_default_algorithms
+from pydantic import (
+    Field,
+    EmailStr,
+    field_serializer,
+    ConfigDict,
+    field_validator,
+)
 
+from app.cache.lru import LRUCache
+from app.obs import panels
 from app.schemas import BackendBase
+from app.security.jwk import JWK, is_symmetric, thumbprint, to_jwk
+
+Claims = dict[str, Any]
+
+
+class TokenFormat(StrEnum):
+    jwt = auto()
+    # Random reference, claims are kept server side
+    reference = auto()
+
+
+@functools.cache
+def load_key(algorithm: str, key: str) -> Any:
+    # Parse PEM once, PyJWT returns prepared key objects as is
+    return get_default_algorithms()[algorithm].prepare_key(key)
+
+
+class JWTCodec:
+    algorithm: str
+    issuer: str | None
+    audience: list[str] | None
+    kid: str | None
+    signing_key: Any | None
+    verifying_key: Any
+    keys: dict[str, Any]
+
+    def __init__(
+        self,
+        algorithm: str,
+        private_key: str | None,
+        public_key: str,
+        *,
+        issuer: str | None = None,
+        audience: list[str] | None = None,
+        kid: str | None = None,
+        verify_keys: list[str] | dict[str, str] | None = None,
+    ):
+        self.algorithm = algorithm
+        self.issuer = issuer
+        self.audience = audience
+        # Verify only without a private key
+        self.signing_key = (
+            load_key(algorithm, private_key) if private_key else None
+        )
+        self.verifying_key = load_key(algorithm, public_key)
+        # Tokens are signed by one key and verified by any active key
+        self.kid = kid or self.get_kid(self.verifying_key)
+        self.keys = {}
+        if self.kid is not None:
+            self.keys[self.kid] = self.verifying_key
+        # Previous keys keep the kid their tokens were signed with: the
+        # configured one if given as a mapping, the thumbprint otherwise
+        if isinstance(verify_keys, dict):
+            for key_id, pem in verify_keys.items():
+                self.keys.setdefault(key_id, load_key(algorithm, pem))
+        else:
+            for pem in verify_keys or []:
+                key = load_key(algorithm, pem)
+                key_id = self.get_kid(key)
+                if key_id is not None:
+                    self.keys.setdefault(key_id, key)
+
+    def get_kid(self, key: Any) -> str | None:
+        if is_symmetric(self.algorithm):
+            return None
+        return thumbprint(to_jwk(self.algorithm, key))
+
+    def encode(self, claims: Claims) -> str:
+        if self.signing_key is None:
+            raise ValueError("No private key to sign tokens with")
+        headers = {"kid": self.kid} if self.kid else None
+        return jwt.encode(
+            claims, self.signing_key, algorithm=self.algorithm, headers=headers
+        )
+
+    def decode(self, token: str) -> Claims:
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            return self.decode_with(token, self.verifying_key)
+        key = self.keys.get(kid)
+        if key is None:
+            raise jwt.InvalidSignatureError("Unknown key id")
+        return self.decode_with(token, key)
+
+    def decode_with(self, token: str, key: Any) -> Claims:
+        return jwt.decode(
+            token,
+            key,
+            algorithms=[self.algorithm],
+            issuer=self.issuer,
+            audience=self.audience,
+        )
+
+    def jwks(self) -> dict[str, list[JWK]]:
+        if is_symmetric(self.algorithm):
+            return {"keys": []}
+        return {
+            "keys": [
+                {
+                    **to_jwk(self.algorithm, key),
+                    "kid": kid,
+                    "use": "sig",
+                    "alg": self.algorithm,
+                }
+                for kid, key in self.keys.items()
+            ]
+        }
 
 
 class TokenParams(BackendBase):
     issuer: str | None = None
     audience: list[str] | None = None
     algorithm: str = "HS256"
-    private_key: str
+    private_key: str | None = None
     public_key: str
     type: str | None = None
+    format: TokenFormat = TokenFormat.jwt
     expires_in: datetime.timedelta
     include: set[str] | None = None
     exclude: set[str] | None = None
+    kid: str | None = None
+    verify_keys: list[str] | dict[str, str] = []
+    cache_size: int = 0
+    cache_ttl: int | None = None
+
+    @field_validator("algorithm")
+    @classmethod
+    def validate_algorithm(cls, value: str) -> str:
+        if value not in get_default_algorithms():
+            raise ValueError(f"Unsupported algorithm: {value}")
+        return value
+
+    @functools.cached_property
+    def cache(self) -> LRUCache[bytes, Claims] | None:
+        if self.cache_size <= 0:
+            return None
+        return LRUCache(self.cache_size, ttl=self.cache_ttl)
+
+    @functools.cached_property
+    def codec(self) -> JWTCodec:
+        return JWTCodec(
+            self.algorithm,
+            self.private_key,
+            self.public_key,
+            issuer=self.issuer,
+            audience=self.audience,
+            kid=self.kid,
+            verify_keys=self.verify_keys,
+        )
 
 
 class JWTClaims(BackendBase):
@@ -45,6 +195,30 @@ class JWTClaims(BackendBase):
     model_config = ConfigDict(extra="allow")
 
 
+def build_claims(
+    params: TokenParams, *, subject: str, **payload: Any
+) -> Claims:
+    now = int(time.time())
+    claims = {
+        "jti": str(uuid.uuid4()),
+        "iss": params.issuer,
+        "aud": params.audience,
+        "typ": params.type,
+        "sub": subject,
+        "iat": now,
+        "nbf": now,
+        "exp": now + int(params.expires_in.total_seconds()),
+        **payload,
+    }
+    return {
+        k: v
+        for k, v in claims.items()
+        if v is not None
+        and (params.include is None or k in params.include)
+        and (params.exclude is None or k not in params.exclude)
+    }
+
+
 def encode_jwt(
     params: TokenParams,
     *,
@@ -55,40 +229,57 @@ def encode_jwt(
     display_name: str | None = None,
     **payload: Any,
 ) -> str:
-    now = datetime.datetime.now(datetime.UTC)
-    claims = JWTClaims(
-        iss=params.issuer,
-        aud=params.audience,
-        typ=params.type,
-        sub=subject,
-        iat=now,
-        nbf=now,
-        exp=now + params.expires_in,
+    claims = build_claims(
+        params,
+        subject=subject,
         email=email,
         first_name=first_name,
         last_name=last_name,
         display_name=display_name,
         **payload,
     )
-    encoded = jwt.encode(
-        claims.model_dump(
-            mode="json",
-            exclude_none=True,
-            include=params.include,
-            exclude=params.exclude,
-        ),
-        params.private_key,
-        algorithm=params.algorithm,
-    )
-    return encoded
+    return params.codec.encode(claims)
+
+
+def cache_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def get_cached_claims(params: TokenParams, key: bytes) -> Claims | None:
+    if params.cache is None:
+        return None
+    # Cached claims are shared between requests, do not mutate them
+    claims = params.cache.get(key)
+    token_type = params.type or "default"
+    if claims is not None:
+        panels.TOKEN_CACHE_HITS.labels(token_type=token_type).inc()
+    else:
+        panels.TOKEN_CACHE_MISSES.labels(token_type=token_type).inc()
+    return claims
+
+
+def set_cached_claims(params: TokenParams, key: bytes, claims: Claims) -> None:
+    if params.cache is None:
+        return
+    ttl = claims["exp"] - time.time() if "exp" in claims else None
+    params.cache.set(key, claims, ttl=ttl)
+
+
+def decode_claims(params: TokenParams, token: str) -> Claims:
+    if params.cache is None:
+        return params.codec.decode(token)
+    key = cache_key(token)
+    claims = get_cached_claims(params, key)
+    if claims is None:
+        claims = params.codec.decode(token)
+        set_cached_claims(params, key, claims)
+    return claims
+
+
+def peek_claims(token: str) -> Claims:
+    # Unverified, only to pick the params to verify the token with
+    return jwt.decode(token, options={"verify_signature": False})
 
 
 def decode_jwt(params: TokenParams, token: str) -> JWTClaims:
-    decoded = jwt.decode(
-        token,
-        params.public_key,
-        algorithms=[params.algorithm],
-        issuer=params.issuer,
-        audience=params.audience,
-    )
-    return JWTClaims.model_validate(decoded)
+    return JWTClaims.model_validate(decode_claims(params, token))
@@ -1,54 +1,78 @@
+import secrets
 from abc import ABC
-from typing import assert_never
+from typing import Any, assert_never
 
 from aiogram import Bot
-from fastapi import BackgroundTasks
 
 from app.cache.adapter import CacheAdapter
 from app.cache.dependencies import CacheDep
 from app.db.dependencies import UOWDep
+from app.db.types import ID
 from app.db.uow import UOW
 from app.mail.client import MailClient
-from app.mail.dependencies import MailDep
+from app.mail.dependencies import MailProviderDep
 from app.oauth.dependencies import (
-    GoogleSSODep,
-    YandexSSODep,
-    TelegramSSODep,
+    GoogleSSOProviderDep,
+    YandexSSOProviderDep,
+    TelegramSSOProviderDep,
     SSOName,
 )
 from app.oauth.interfaces import IOAuth2
-from app.telegram.dependencies import BotDep
+from app.outbox.channels import outbox_dispatcher
+from app.outbox.schemas import OutboxChannel
+from app.providers import Provider
+from app.telegram.dependencies import BotProviderDep
+from app.users.schemas import UserRead
 
 
 class Service(ABC):
     uow: UOW
     cache: CacheAdapter
-    mail: MailClient
-    bot: Bot
-    google_sso: IOAuth2
-    yandex_sso: IOAuth2
-    telegram_sso: IOAuth2
-    background: BackgroundTasks
+
+    # Created on first use, most requests need none of them
+    mail_provider: Provider[MailClient]
+    bot_provider: Provider[Bot]
+    google_sso_provider: Provider[IOAuth2]
+    yandex_sso_provider: Provider[IOAuth2]
+    telegram_sso_provider: Provider[IOAuth2]
 
     def __init__(
         self,
         uow: UOWDep,
         cache: CacheDep,
-        mail: MailDep,
-        bot: BotDep,
-        google_sso: GoogleSSODep,
-        yandex_sso: YandexSSODep,
-        telegram_sso: TelegramSSODep,
-        background: BackgroundTasks,
+        mail: MailProviderDep,
+        bot: BotProviderDep,
+        google_sso: GoogleSSOProviderDep,
+        yandex_sso: YandexSSOProviderDep,
+        telegram_sso: TelegramSSOProviderDep,
     ):
         self.uow = uow
         self.cache = cache
-        self.mail = mail
-        self.bot = bot
-        self.google_sso = google_sso
-        self.yandex_sso = yandex_sso
-        self.telegram_sso = telegram_sso
-        self.background = background
+        self.mail_provider = mail
+        self.bot_provider = bot
+        self.google_sso_provider = google_sso
+        self.yandex_sso_provider = yandex_sso
+        self.telegram_sso_provider = telegram_sso
+
+    @property
+    def mail(self) -> MailClient:
+        return self.mail_provider()
+
+    @property
+    def bot(self) -> Bot:
+        return self.bot_provider()
+
+    @property
+    def google_sso(self) -> IOAuth2:
+        return self.google_sso_provider()
+
+    @property
+    def yandex_sso(self) -> IOAuth2:
+        return self.yandex_sso_provider()
+
+    @property
+    def telegram_sso(self) -> IOAuth2:
+        return self.telegram_sso_provider()
 
     def resolve_sso(self, provider: SSOName) -> IOAuth2:
         match provider:
@@ -60,3 +84,52 @@ class Service(ABC):
                 return self.telegram_sso
             case _:
                 assert_never(provider)
+
+    async def enqueue(
+        self, channel: OutboxChannel, payload: dict[str, Any]
+    ) -> None:
+        """Delivered by the outbox dispatcher once the UOW commits."""
+        await self.uow.outbox.add(channel, payload)
+        self.uow.after_commit(outbox_dispatcher.wake)
+
+    @staticmethod
+    def code_payload(code_for: ID | None) -> dict[str, Any]:
+        if code_for is None:
+            return {}
+        # Lets a retried delivery re-send the code it created
+        return {"code_for": str(code_for), "code_ref": secrets.token_hex(8)}
+
+    async def send_mail(
+        self,
+        user: UserRead,
+        subject: str,
+        template: str,
+        *,
+        code_for: ID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Rendered on delivery. With code_for, a verification code for
+        that user is created then and passed to the template as code."""
+        await self.enqueue(
+            OutboxChannel.mail,
+            {
+                "user": user.model_dump(mode="json"),
+                "subject": subject,
+                "template": template,
+                "context": kwargs,
+                **self.code_payload(code_for),
+            },
+        )
+
+    async def send_telegram(
+        self, chat_id: int, text: str, *, code_for: ID | None = None
+    ) -> None:
+        """With code_for, {code} in the text is replaced on delivery."""
+        await self.enqueue(
+            OutboxChannel.telegram,
+            {
+                "chat_id": chat_id,
+                "text": text,
+                **self.code_payload(code_for),
+            },
+        )
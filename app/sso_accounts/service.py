@@ -6,6 +6,7 @@ from app.sso_accounts.exceptions import (
 )
 from app.sso_accounts.schemas import SSOAccountRead
 from app.users.schemas import UserRead
+from app.users.versions import invalidate_principal
 
 
 class SSOAccountService(Service):
@@ -26,4 +27,5 @@ class SSOAccountService(Service):
     async def delete(self, account: SSOAccountRead) -> SSOAccountRead:
         if account.provider == "telegram":
             await self.uow.users.update(account.user_id, telegram_id=None)
+            await invalidate_principal(self.uow, self.cache, account.user_id)
         return await self.uow.sso_accounts.delete(account.id)
@@ -1,18 +1,40 @@
-from typing import Annotated, AsyncGenerator
+from typing import Annotated
 
 from aiogram import Bot
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
 from fastapi import Depends
 
 from app.config import settings
+from app.providers import Provider
 
 
-async def get_bot() -> AsyncGenerator[Bot, None]:
-    async with Bot(
+def create_bot() -> Bot:
+    return Bot(
         settings.telegram.bot_token,
+        session=AiohttpSession(limit=settings.telegram.bot_connection_limit),
         default=DefaultBotProperties(),
-    ) as bot:
-        yield bot
+    )
+
+
+# One bot and connection pool per process, closed by the lifespan.
+# Created on first use: the token is only validated when Telegram is used
+bot_provider = Provider(create_bot)
+
+
+async def close_bot() -> None:
+    if bot_provider.instance is not None:
+        await bot_provider.instance.session.close()
+        bot_provider.instance = None
+
+
+def get_bot() -> Bot:
+    return bot_provider()
+
+
+def get_bot_provider() -> Provider[Bot]:
+    return bot_provider
 
 
 BotDep = Annotated[Bot, Depends(get_bot)]
+BotProviderDep = Annotated[Provider[Bot], Depends(get_bot_provider)]
@@ -3,12 +3,15 @@ from typing import Annotated
 from fastapi import APIRouter, Depends
 
 from app.db.schemas import PageParams, Page
+from app.personal_tokens.schemas import TokenScope
 from app.users.dependencies import Requires, get_user_by_id, UserServiceDep
 from app.users.schemas import UserRead, UserUpdate, Role
 
 router = APIRouter(
     tags=["Admin"],
-    dependencies=[Depends(Requires(is_superuser=True))],
+    dependencies=[
+        Depends(Requires(is_superuser=True, scopes={TokenScope.admin}))
+    ],
 )
 
 
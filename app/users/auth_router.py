@@ -1,13 +1,19 @@
 from typing import Annotated
 
-from fastapi import Depends, APIRouter
+from fastapi import Depends, APIRouter, Form
 from pydantic import EmailStr
 from starlette import status
 
+from app.config import settings
+from app.limiter.dependencies import RateLimit, by_email
+from app.personal_tokens.schemas import TokenScope
 from app.schemas import BackendOK, backend_ok
+from app.security.schemas import IntrospectionRequest, IntrospectionResponse
 from app.users.dependencies import (
     UserServiceDep,
+    GetCurrentUser,
 )
+from app.users.exceptions import NoPermission
 from app.users.auth import AuthorizationForm
 from app.users.schemas import (
     UserCreate,
@@ -18,6 +24,9 @@ from app.users.schemas import (
 )
 
 auth_router = APIRouter(prefix="/auth", tags=["Auth"])
+# Introspection only reads, personal tokens need the introspect scope
+# rather than write
+get_introspector = GetCurrentUser(unsafe_scope=TokenScope.introspect)
 
 
 @auth_router.post("/register", status_code=status.HTTP_201_CREATED)
@@ -40,6 +49,14 @@ async def register(
 - **Refresh token grant** requires refresh token.
     """,
     status_code=status.HTTP_200_OK,
+    dependencies=[
+        Depends(RateLimit("token:ip", settings.limiter.limiter_token_ip)),
+        Depends(
+            RateLimit(
+                "token:email", settings.limiter.limiter_token_email, by_email
+            )
+        ),
+    ],
 )
 async def get_token(
     service: UserServiceDep,
@@ -48,9 +65,47 @@ async def get_token(
     return await service.authorize(form)
 
 
+@auth_router.post(
+    "/revoke",
+    description="Revokes an access or refresh token (RFC 7009).",
+    status_code=status.HTTP_200_OK,
+)
+async def revoke_token(
+    service: UserServiceDep, token: Annotated[str, Form()]
+) -> BackendOK:
+    await service.revoke_token(token)
+    return backend_ok
+
+
+@auth_router.post(
+    "/introspect",
+    description="""Validates a batch of tokens (RFC 7662 style).
+
+Requires a superuser, with the introspect scope for personal tokens.""",
+    status_code=status.HTTP_200_OK,
+)
+async def introspect(
+    service: UserServiceDep,
+    user: Annotated[UserRead, Depends(get_introspector)],
+    request: IntrospectionRequest,
+) -> IntrospectionResponse:
+    # RFC 7662 2.1: the caller must be authorized to introspect
+    if not user.is_superuser:
+        raise NoPermission()
+    return await service.introspect(request.tokens)
+
+
 @auth_router.post(
     "/reset-password-request",
     status_code=status.HTTP_200_OK,
+    dependencies=[
+        Depends(RateLimit("reset:ip", settings.limiter.limiter_reset_ip)),
+        Depends(
+            RateLimit(
+                "reset:email", settings.limiter.limiter_reset_email, by_email
+            )
+        ),
+    ],
 )
 async def reset_password_request(
     service: UserServiceDep, email: EmailStr
@@ -0,0 +1,130 @@
+import json
+from typing import Any, Iterable, Literal
+
+from redis.asyncio import Redis
+
+from app.cache.broadcast import Subscriber
+from app.cache.dependencies import redis_client
+from app.cache.lru import LRUCache
+from app.config import settings
+from app.obs import panels
+from app.users.models import UserOrm
+from app.users.schemas import UserPrincipal, UserRead
+
+
+class UserCache:
+    """Users by id, email and Telegram id.
+
+    A per-worker LRU in front of Redis. Lookups that found no user are
+    cached as well, for a shorter time. Invalidations are broadcast so
+    every worker drops its local copy. Password hashes are never cached,
+    cached users only tell whether a password is set.
+    """
+
+    redis: Redis
+    key: str
+    ttl: int
+    negative_ttl: int
+    # False marks a lookup that found no user
+    local: LRUCache[str, UserRead | Literal[False]]
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        key: str = "fastapi",
+        ttl: int = 5 * 60,
+        negative_ttl: int = 60,
+        local_size: int = 10_000,
+        local_ttl: int = 10,
+    ):
+        self.redis = redis
+        self.key = key
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.local = LRUCache(local_size, ttl=local_ttl)
+        self.subscriber = Subscriber(
+            redis,
+            f"{key}:users:invalidated",
+            self.local.delete,
+            on_connect=self.clear_local,
+            on_disconnect=self.local.clear,
+        )
+
+    @staticmethod
+    def get_keys(user: UserRead | UserOrm) -> set[str]:
+        keys = {f"id:{user.id}"}
+        if user.email is not None:
+            keys.add(f"email:{user.email}")
+        if user.telegram_id is not None:
+            keys.add(f"telegram_id:{user.telegram_id}")
+        return keys
+
+    def get_key(self, key: str) -> str:
+        return f"{self.key}:users:{key}"
+
+    async def get(
+        self, field: str, value: Any
+    ) -> tuple[bool, UserRead | None]:
+        """Returns whether the lookup is cached and its result."""
+        key = f"{field}:{value}"
+        cached = self.local.get(key)
+        if cached is not None:
+            panels.USER_CACHE_HITS.labels(layer="local").inc()
+            return True, cached if cached is not False else None
+        data = await self.redis.get(self.get_key(key))
+        if data is None:
+            panels.USER_CACHE_MISSES.inc()
+            return False, None
+        panels.USER_CACHE_HITS.labels(layer="redis").inc()
+        payload = json.loads(data)
+        if payload is None:
+            self.local.set(key, False, ttl=self.negative_ttl)
+            return True, None
+        user = UserPrincipal.model_validate(payload)
+        self.local.set(key, user)
+        return True, user
+
+    async def set(self, field: str, value: Any, user: UserRead | None) -> None:
+        key = f"{field}:{value}"
+        cached: UserRead | Literal[False] = False
+        if user is None:
+            data, ttl = "null", self.negative_ttl
+        else:
+            payload = user.model_dump(mode="json")
+            payload["password_set"] = user.has_password
+            cached = UserPrincipal.model_validate(payload)
+            data, ttl = json.dumps(payload), self.ttl
+        await self.redis.set(self.get_key(key), data, ex=ttl)
+        self.local.set(key, cached, ttl=ttl)
+
+    async def invalidate(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+        for key in keys:
+            self.local.delete(key)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.delete(*(self.get_key(key) for key in keys))
+            for key in keys:
+                pipe.publish(self.subscriber.channel, key)
+            await pipe.execute()
+
+    async def clear_local(self) -> None:
+        self.local.clear()
+
+    def start(self) -> None:
+        self.subscriber.start()
+
+    async def stop(self) -> None:
+        await self.subscriber.stop()
+
+
+user_cache = UserCache(
+    redis_client,
+    key=settings.cache.redis_key,
+    ttl=settings.auth.user_cache_ttl,
+    negative_ttl=settings.auth.user_cache_negative_ttl,
+    local_size=settings.auth.user_cache_local_size,
+    local_ttl=settings.auth.user_cache_local_ttl,
+)
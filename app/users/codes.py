@@ -0,0 +1,194 @@
+import abc
+import functools
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import string
+import time
+from typing import assert_never
+
+from redis.exceptions import RedisError
+
+from app.cache.adapter import CacheAdapter
+from app.config import settings
+from app.db.types import ID
+
+logger = logging.getLogger(__name__)
+
+
+class ICodeEngine(abc.ABC):
+    """Verification codes sent by email or Telegram"""
+
+    @abc.abstractmethod
+    async def create(self, user_id: ID, ref: str | None = None) -> str:
+        """Creating again with the same ref returns the same code while it
+        is valid, so retried deliveries don't replace the code."""
+
+    @abc.abstractmethod
+    async def validate(self, user_id: ID, code: str) -> bool:
+        """Checks the code and consumes it."""
+
+
+class CacheCodeEngine(ICodeEngine):
+    """Random codes stored in the cache until used or expired."""
+
+    def __init__(
+        self,
+        cache: CacheAdapter,
+        *,
+        length: int,
+        expire: int,
+        max_attempts: int,
+    ):
+        self.cache = cache
+        self.length = length
+        self.expire = expire
+        self.max_attempts = max_attempts
+
+    async def create(self, user_id: ID, ref: str | None = None) -> str:
+        if ref is not None:
+            code, created_for = await self.cache.client.mget(
+                f"{self.cache.key}:codes:{user_id}",
+                f"{self.cache.key}:codes:{user_id}:ref",
+            )
+            if code is not None and created_for == ref.encode():
+                return str(json.loads(code))
+        code = "".join(
+            secrets.choice(string.digits) for _ in range(self.length)
+        )
+        await self.cache.add(f"codes:{user_id}", code, expire=self.expire)
+        await self.cache.delete(f"codes:{user_id}:attempts")
+        if ref is not None:
+            await self.cache.client.set(
+                f"{self.cache.key}:codes:{user_id}:ref", ref, ex=self.expire
+            )
+        return code
+
+    async def validate(self, user_id: ID, code: str) -> bool:
+        # The code is dropped after max_attempts wrong guesses
+        return await self.cache.consume(
+            f"codes:{user_id}", code, max_attempts=self.max_attempts
+        )
+
+
+class TOTPCodeEngine(ICodeEngine):
+    """Codes derived from a secret, the user id and a time step (RFC 6238).
+
+    Nothing is stored when a code is sent. A code stays valid for at least
+    expire seconds, and a marker of the used step prevents its replay.
+    Sends should be at least one step apart, otherwise they repeat the code.
+
+    Codes can't be dropped after wrong guesses as they are derived, so the
+    user is locked out of codes for the lifetime of one after max_attempts
+    failures. Sending a new code doesn't lift the lockout.
+    """
+
+    def __init__(
+        self,
+        secret: bytes,
+        cache: CacheAdapter,
+        *,
+        length: int,
+        step: int,
+        expire: int,
+        max_attempts: int,
+    ):
+        self.secret = secret
+        self.cache = cache
+        self.length = length
+        self.step = step
+        self.window = max(0, expire // step)
+        self.max_attempts = max_attempts
+
+    def derive(self, user_id: ID, counter: int) -> str:
+        digest = hmac.new(
+            self.secret, f"{user_id}:{counter}".encode(), hashlib.sha256
+        ).digest()
+        # RFC 4226 dynamic truncation
+        offset = digest[-1] & 0x0F
+        value = int.from_bytes(digest[offset : offset + 4]) & 0x7FFFFFFF
+        return str(value % 10**self.length).zfill(self.length)
+
+    async def create(self, user_id: ID, ref: str | None = None) -> str:
+        # Earlier codes stay valid, a retry may send the next step's code
+        return self.derive(user_id, int(time.time()) // self.step)
+
+    async def validate(self, user_id: ID, code: str) -> bool:
+        if not await self.attempt(user_id):
+            return False
+        current = int(time.time()) // self.step
+        matched = None
+        # Compare every step of the window, so timing doesn't reveal a match
+        for counter in range(current - self.window, current + 1):
+            if hmac.compare_digest(self.derive(user_id, counter), code):
+                matched = counter
+        if matched is None:
+            return False
+        if not await self.mark_used(user_id, matched):
+            return False
+        await self.reset_attempts(user_id)
+        return True
+
+    async def attempt(self, user_id: ID) -> bool:
+        try:
+            return await self.cache.attempt(
+                f"codes:{user_id}:attempts",
+                max_attempts=self.max_attempts,
+                expire=self.step * (self.window + 1),
+            )
+        except RedisError:
+            logger.warning("Code attempt limit skipped, Redis unavailable")
+            return True
+
+    async def reset_attempts(self, user_id: ID) -> None:
+        try:
+            await self.cache.delete(f"codes:{user_id}:attempts")
+        except RedisError:
+            logger.warning("Code attempts not reset, Redis unavailable")
+
+    async def mark_used(self, user_id: ID, counter: int) -> bool:
+        try:
+            marked = await self.cache.client.set(
+                f"{self.cache.key}:codes:{user_id}:{counter}",
+                1,
+                nx=True,
+                ex=self.step * (self.window + 1),
+            )
+        except RedisError:
+            # The code expires soon anyway, prefer availability
+            logger.warning("Code replay check skipped, Redis unavailable")
+            return True
+        return bool(marked)
+
+
+@functools.cache
+def get_code_secret() -> bytes:
+    if settings.auth.code_secret:
+        return settings.auth.code_secret.encode()
+    return hmac.digest(
+        settings.auth.jwt_private_key.read_bytes(), b"codes", "sha256"
+    )
+
+
+def get_code_engine(cache: CacheAdapter) -> ICodeEngine:
+    match settings.auth.code_engine:
+        case "totp":
+            return TOTPCodeEngine(
+                get_code_secret(),
+                cache,
+                length=settings.auth.code_length,
+                step=settings.auth.code_step,
+                expire=settings.auth.code_expire,
+                max_attempts=settings.auth.code_max_attempts,
+            )
+        case "cache":
+            return CacheCodeEngine(
+                cache,
+                length=settings.auth.code_length,
+                expire=settings.auth.code_expire,
+                max_attempts=settings.auth.code_max_attempts,
+            )
+        case _:
+            assert_never(settings.auth.code_engine)
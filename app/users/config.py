@@ -1,6 +1,9 @@
+import datetime
 from pathlib import Path
+from typing import Literal
 
 from app.schemas import BackendSettings
+from app.security.tokens import TokenFormat, TokenParams
 
 
 class AuthSettings(BackendSettings):
@@ -8,9 +11,38 @@ class AuthSettings(BackendSettings):
     jwt_audience: list[str] = ["https://example.com"]  # TODO
     jwt_private_key: Path = Path("certs") / "jwt-private.pem"
     jwt_public_key: Path = Path("certs") / "jwt-public.pem"
-    jwt_algorithm: str = "RS256"
+    # Previous public keys, still accepted during rotation. A mapping of
+    # kid to path if JWT_KID was set when they were active
+    jwt_verify_keys: list[Path] | dict[str, Path] = []
+    jwt_kid: str | None = None  # RFC 7638 thumbprint by default
+    jwt_jwks_max_age: int = 24 * 60 * 60
+    jwt_algorithm: str = "RS256"  # RS256, ES256, EdDSA, ...
     jwt_access_expire: int = 60 * 60  # 1 hour
     jwt_refresh_expire: int = 30 * 24 * 60  # 30 days
+    jwt_cache_size: int = 10_000  # 0 to disable
+    jwt_cache_ttl: int = 5 * 60
+    jwt_stateless: bool = False
+    access_token_format: TokenFormat = TokenFormat.jwt
+    revocation_capacity: int = 100_000
+    revocation_error_rate: float = 0.001
+    revocation_rebuild_interval: int = 60 * 60
+    user_cache_enabled: bool = True
+    user_cache_ttl: int = 5 * 60
+    user_cache_negative_ttl: int = 60
+    user_cache_local_size: int = 10_000
+    user_cache_local_ttl: int = 10
+    email_filter_enabled: bool = True
+    email_filter_capacity: int = 1_000_000
+    email_filter_error_rate: float = 0.01
+    email_filter_rebuild_interval: int = 6 * 60 * 60
+    email_filter_batch_size: int = 10_000
+    hasher_workers: int = 2
+    hasher_max_pending: int = 32
+    hasher_retry_after: int = 1
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 64 * 1024  # KiB
+    argon2_parallelism: int = 4
+    # Tune them with make calibrate on the slowest host
 
     first_user_email: str = "user@example.com"
     first_user_password: str = "password"
@@ -18,3 +50,42 @@ class AuthSettings(BackendSettings):
     admin_password: str = "changethis"
     code_length: int = 6
     code_expire: int = 5 * 60
+    code_max_attempts: int = 5
+    # Codes are created when the outbox delivers them. A retried delivery
+    # re-sends the same code while it is valid (cache) or a newer one that
+    # doesn't invalidate the first (totp)
+    code_engine: Literal["cache", "totp"] = "cache"
+    # TOTP engine, derived from the JWT private key by default
+    code_secret: str | None = None
+    code_step: int = 60  # keep it at most CODE_COOLDOWN
+
+    def read_verify_keys(self) -> list[str] | dict[str, str]:
+        if isinstance(self.jwt_verify_keys, dict):
+            return {
+                kid: path.read_text()
+                for kid, path in self.jwt_verify_keys.items()
+            }
+        return [path.read_text() for path in self.jwt_verify_keys]
+
+    def get_token_params(
+        self,
+        token_type: str,
+        expires_in: int,
+        token_format: TokenFormat = TokenFormat.jwt,
+        *,
+        signing: bool = True,
+    ) -> TokenParams:
+        return TokenParams(
+            issuer=self.jwt_issuer,
+            audience=self.jwt_audience,
+            algorithm=self.jwt_algorithm,
+            private_key=self.jwt_private_key.read_text() if signing else None,
+            public_key=self.jwt_public_key.read_text(),
+            kid=self.jwt_kid,
+            verify_keys=self.read_verify_keys(),
+            type=token_type,
+            format=token_format,
+            expires_in=datetime.timedelta(seconds=expires_in),
+            cache_size=self.jwt_cache_size,
+            cache_ttl=self.jwt_cache_ttl,
+        )
@@ -1,2 +1,13 @@
 TOKEN_HEADER_NAME = "Authorization"
 TOKEN_COOKIE_NAME = "access_token"
+
+# User fields carried by access tokens in stateless mode
+STATELESS_CLAIMS = {
+    "telegram_id",
+    "is_active",
+    "is_superuser",
+    "is_verified",
+    "has_password",
+    "created_at",
+    "updated_at",
+}
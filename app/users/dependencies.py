@@ -1,6 +1,7 @@
 from typing import Annotated
 
 from fastapi import Depends
+from starlette.requests import Request
 from fastapi.security import (
     OAuth2AuthorizationCodeBearer,
     APIKeyHeader,
@@ -8,6 +9,10 @@ from fastapi.security import (
 )
 
 from app.db.types import ID
+from app.personal_tokens.exceptions import InsufficientScope
+from app.personal_tokens.schemas import TokenScope
+from app.personal_tokens.service import PersonalTokenService
+from app.personal_tokens.tokens import is_personal_token
 from app.users.auth import BackendAuth
 from app.users.constants import TOKEN_HEADER_NAME, TOKEN_COOKIE_NAME
 from app.users.exceptions import NoPermission
@@ -15,6 +20,7 @@ from app.users.schemas import UserRead
 from app.users.service import UserService
 
 UserServiceDep = Annotated[UserService, Depends()]
+PersonalTokenServiceDep = Annotated[PersonalTokenService, Depends()]
 auth = BackendAuth(
     tokenUrl="auth/token", scheme_name="Password", auto_error=False
 )
@@ -54,19 +60,50 @@ def get_token(
     return token
 
 
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
 class GetCurrentUser:
+    # Scope a personal token needs for requests with side effects
+    unsafe_scope: TokenScope
+
+    def __init__(self, unsafe_scope: TokenScope = TokenScope.write):
+        self.unsafe_scope = unsafe_scope
+
     async def __call__(
         self,
+        request: Request,
         users: UserServiceDep,
+        personal_tokens: PersonalTokenServiceDep,
         token: Annotated[str, Depends(get_token)],
     ) -> UserRead:
-        return await users.validate_token(token)
+        # Scopes only restrict personal tokens, sessions may do anything
+        scopes: set[TokenScope] | None = None
+        if is_personal_token(token):
+            user, scopes = await personal_tokens.authenticate(token)
+            if (
+                request.method not in SAFE_METHODS
+                and self.unsafe_scope not in scopes
+            ):
+                raise InsufficientScope()
+        else:
+            user = await users.validate_token(token)
+        request.state.user = user
+        request.state.scopes = scopes
+        return user
 
 
 get_user = GetCurrentUser()
 UserDep = Annotated[UserRead, Depends(get_user)]
 
 
+def get_scopes(request: Request, _user: UserDep) -> set[TokenScope] | None:
+    return request.state.scopes  # type: ignore[no-any-return]
+
+
+ScopesDep = Annotated[set[TokenScope] | None, Depends(get_scopes)]
+
+
 class Requires:
     def __init__(
         self,
@@ -74,16 +111,19 @@ class Requires:
         has_password: bool | None = None,
         is_verified: bool | None = None,
         is_active: bool | None = None,
+        scopes: set[TokenScope] | None = None,
     ):
         self.is_superuser = is_superuser
         self.has_password = has_password
         self.is_verified = is_verified
         self.is_active = is_active
+        self.scopes = scopes
 
     async def __call__(
         self,
         users: UserServiceDep,
         user: UserDep,
+        scopes: ScopesDep,
     ) -> UserRead:
         if (
             self.is_superuser is not None
@@ -102,6 +142,12 @@ class Requires:
             raise NoPermission()
         if self.is_active is not None and user.is_active != self.is_active:
             raise NoPermission()
+        if (
+            self.scopes is not None
+            and scopes is not None
+            and not self.scopes <= scopes
+        ):
+            raise InsufficientScope()
         return user
 
 
@@ -0,0 +1,65 @@
+from typing import AsyncIterator
+
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache.bloom import SharedBloomFilter
+from app.cache.dependencies import redis_client
+from app.config import settings
+from app.db.connection import async_session_factory
+from app.users.models import UserOrm
+
+
+class EmailFilter(SharedBloomFilter):
+    """Emails of registered users.
+
+    If the filter doesn't contain an email, no user has it and the lookup
+    can skip the database.
+    """
+
+    session_factory: async_sessionmaker[AsyncSession]
+    batch_size: int
+
+    def __init__(
+        self,
+        redis: Redis,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        key: str = "fastapi",
+        capacity: int = 1_000_000,
+        error_rate: float = 0.01,
+        rebuild_interval: int = 6 * 60 * 60,
+        batch_size: int = 10_000,
+    ):
+        super().__init__(
+            redis,
+            f"{key}:users:emails",
+            name="emails",
+            capacity=capacity,
+            error_rate=error_rate,
+            rebuild_interval=rebuild_interval,
+        )
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+
+    async def scan(self) -> AsyncIterator[str]:
+        stmt = (
+            select(UserOrm.email)
+            .where(UserOrm.email.is_not(None))
+            .execution_options(yield_per=self.batch_size)
+        )
+        async with self.session_factory() as session:
+            async for email in await session.stream_scalars(stmt):
+                yield email
+
+
+email_filter = EmailFilter(
+    redis_client,
+    async_session_factory,
+    key=settings.cache.redis_key,
+    capacity=settings.auth.email_filter_capacity,
+    error_rate=settings.auth.email_filter_error_rate,
+    rebuild_interval=settings.auth.email_filter_rebuild_interval,
+    batch_size=settings.auth.email_filter_batch_size,
+)
@@ -6,7 +6,7 @@ from app.exceptions import BackendError
 class UserAlreadyExists(BackendError):
     message = "User with this email already exists"
     error_code = "user_already_exists"
-    status_code = status.HTTP_400_BAD_REQUEST
+    status_code = status.HTTP_409_CONFLICT
 
 
 class Unauthorized(BackendError):
@@ -34,6 +34,16 @@ class InvalidToken(Unauthorized):
     error_code = "invalid_token"
 
 
+class RefreshTokenReused(Unauthorized):
+    message = "Refresh token has been revoked or already used"
+    error_code = "refresh_token_reused"
+
+
+class TokenRevoked(Unauthorized):
+    message = "Token has been revoked"
+    error_code = "token_revoked"
+
+
 class InvalidTokenType(Unauthorized):
     error_code = "invalid_token_type"
 
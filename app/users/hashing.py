@@ -0,0 +1,13 @@
+from app.config import settings
+from app.security.hashing import PasswordHasher, make_context
+
+password_hasher = PasswordHasher(
+    make_context(
+        time_cost=settings.auth.argon2_time_cost,
+        memory_cost=settings.auth.argon2_memory_cost,
+        parallelism=settings.auth.argon2_parallelism,
+    ),
+    max_workers=settings.auth.hasher_workers,
+    max_pending=settings.auth.hasher_max_pending,
+    retry_after=settings.auth.hasher_retry_after,
+)
@@ -0,0 +1,21 @@
+import json
+
+from fastapi import APIRouter, Response
+from starlette import status
+
+from app.config import settings
+from app.users.tokens import access_params
+
+router = APIRouter(prefix="/.well-known", tags=["Auth"])
+
+jwks_content = json.dumps(access_params.codec.jwks()).encode()
+
+
+@router.get("/jwks.json", status_code=status.HTTP_200_OK)
+def jwks() -> Response:
+    max_age = settings.auth.jwt_jwks_max_age
+    return Response(
+        content=jwks_content,
+        media_type="application/json",
+        headers={"Cache-Control": f"public, max-age={max_age}"},
+    )
@@ -10,7 +10,7 @@ class UserOrm(BaseOrm, IDMixin, TimestampMixin):
 
     first_name: Mapped[str | None]
     last_name: Mapped[str | None]
-    email: Mapped[str | None] = mapped_column(index=True)
+    email: Mapped[str | None] = mapped_column(index=True, unique=True)
     telegram_id: Mapped[int | None] = mapped_column(index=True)
     hashed_password: Mapped[str | None]
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
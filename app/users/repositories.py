@@ -1,6 +1,15 @@
-from sqlalchemy import select
+import functools
+from typing import Any, Awaitable, Callable, Iterable
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.repository import AlchemyRepository
+from app.db.types import ID
+from app.obs import panels
+from app.users.cache import UserCache
+from app.users.emails import EmailFilter
 from app.users.models import UserOrm
 from app.users.schemas import UserRead
 
@@ -9,16 +18,176 @@ class UserRepository(AlchemyRepository[UserOrm, UserRead]):
     model_type = UserOrm
     schema_type = UserRead
 
+    cache: UserCache | None
+    emails: EmailFilter | None
+    after_commit: Callable[[Callable[[], Awaitable[Any]]], None] | None
+    dirty: bool
+    # Lookups made in this transaction, kept up to date by writes
+    memo: dict[str, UserRead | None]
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        cache: UserCache | None = None,
+        emails: EmailFilter | None = None,
+        after_commit: Callable[[Callable[[], Awaitable[Any]]], None]
+        | None = None,
+    ):
+        super().__init__(session)
+        self.cache = cache
+        self.emails = emails
+        self.after_commit = after_commit
+        self.dirty = False
+        self.memo = {}
+
+    async def cached(
+        self,
+        field: str,
+        value: Any,
+        load: Callable[[Any], Awaitable[UserRead | None]],
+    ) -> UserRead | None:
+        key = f"{field}:{value}"
+        if key in self.memo:
+            return self.memo[key]
+        # Uncommitted changes must not reach the cache
+        if self.cache is None or self.dirty:
+            user = await load(value)
+        else:
+            found, user = await self.cache.get(field, value)
+            if not found:
+                user = await load(value)
+                await self.cache.set(field, value, user)
+        self.memo[key] = user
+        return user
+
+    def remember(self, user: UserRead | None, *stale: UserRead | None) -> None:
+        for old in filter(None, stale):
+            for key in UserCache.get_keys(old):
+                self.memo[key] = None
+        if user is not None:
+            for key in UserCache.get_keys(user):
+                self.memo[key] = user
+
+    async def invalidate(self, *users: UserRead) -> None:
+        self.dirty = True
+        if self.cache is None:
+            return
+        keys = {key for user in users for key in self.cache.get_keys(user)}
+        await self.cache.invalidate(keys)
+        # Again after commit, in case a concurrent read cached the old row
+        if self.after_commit is not None:
+            self.after_commit(functools.partial(self.cache.invalidate, keys))
+
+    async def get(self, ident: ID) -> UserRead | None:
+        return await self.cached("id", ident, super().get)
+
+    def skips(self, email: str) -> bool:
+        # Emails written in this transaction are published after the commit
+        if self.emails is None or f"email:{email}" in self.memo:
+            return False
+        if self.emails.might_contain(email):
+            return False
+        panels.EMAIL_FILTER_SKIPPED.inc()
+        return True
+
     async def get_by_email(self, email: str) -> UserRead | None:
+        if self.skips(email):
+            return None
+        return await self.cached("email", email, self.load_by_email)
+
+    async def get_credentials(self, email: str) -> UserRead | None:
+        """Bypasses the cache, which doesn't hold password hashes."""
+        if self.skips(email):
+            return None
+        return await self.load_by_email(email)
+
+    async def get_by_telegram_id(self, telegram_id: int) -> UserRead | None:
+        return await self.cached(
+            "telegram_id", telegram_id, self.load_by_telegram_id
+        )
+
+    async def load_by_email(self, email: str) -> UserRead | None:
         stmt = select(UserOrm).where(UserOrm.email == email)  # noqa
         result = await self.session.scalar(stmt)
         if result is None:
             return None
         return self.schema_type.model_validate(result)
 
-    async def get_by_telegram_id(self, telegram_id: int) -> UserRead | None:
+    async def load_by_telegram_id(self, telegram_id: int) -> UserRead | None:
         stmt = select(UserOrm).where(UserOrm.telegram_id == telegram_id)  # noqa
         result = await self.session.scalar(stmt)
         if result is None:
             return None
         return self.schema_type.model_validate(result)
+
+    async def get_by_ids(self, idents: Iterable[ID]) -> list[UserRead]:
+        stmt = select(UserOrm).where(UserOrm.id.in_(idents))
+        result = await self.session.scalars(stmt)
+        return [self.schema_type.model_validate(user) for user in result]
+
+    async def add_email(self, email: str | None) -> None:
+        if self.emails is None or email is None:
+            return
+        # A filter rebuilt from a snapshot taken before the commit only
+        # learns the email from a publish made after it
+        if self.after_commit is not None:
+            self.after_commit(functools.partial(self.emails.publish, email))
+        else:
+            await self.emails.publish(email)
+
+    async def on_create(self, user: UserRead) -> None:
+        self.remember(user)
+        await self.add_email(user.email)
+        # Drops cached misses for the new email and Telegram id
+        await self.invalidate(user)
+
+    async def create(self, **data: Any) -> UserRead:
+        user = await super().create(**data)
+        await self.on_create(user)
+        return user
+
+    async def create_unique(self, **data: Any) -> UserRead | None:
+        """Creates the user in one statement, unless the email is taken."""
+        stmt = (
+            insert(UserOrm)
+            .values(**data)
+            .on_conflict_do_nothing(index_elements=[UserOrm.email])
+            .returning(UserOrm)
+        )
+        instance = await self.session.scalar(stmt)
+        if instance is None:
+            return None
+        user = self.schema_type.model_validate(instance)
+        await self.on_create(user)
+        return user
+
+    async def update(
+        self, ident: ID, *, before: UserRead | None = None, **data: Any
+    ) -> UserRead:
+        """Pass the current user as before to spare loading it, its email
+        and Telegram id are the cache keys to invalidate."""
+        if not data:
+            return await super().update(ident)
+        if before is None:
+            before = await super().get(ident)
+        stmt = (
+            update(UserOrm)
+            .where(UserOrm.id == ident)  # noqa
+            .values(**data)
+            .returning(UserOrm)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        user = self.schema_type.model_validate(result.scalar_one())
+        self.remember(user, before)
+        if before is None or before.email != user.email:
+            await self.add_email(user.email)
+        await self.invalidate(*filter(None, (before, user)))
+        return user
+
+    async def delete(self, ident: ID) -> UserRead:
+        user = await super().delete(ident)
+        self.remember(None, user)
+        await self.invalidate(user)
+        return user
@@ -0,0 +1,11 @@
+from app.cache.dependencies import redis_client
+from app.config import settings
+from app.security.revocation import RevocationList
+
+revocation_list = RevocationList(
+    redis_client,
+    key=settings.cache.redis_key,
+    capacity=settings.auth.revocation_capacity,
+    error_rate=settings.auth.revocation_error_rate,
+    rebuild_interval=settings.auth.revocation_rebuild_interval,
+)
@@ -1,5 +1,5 @@
 from enum import StrEnum, auto
-from typing import Literal
+from typing import Any, Literal, Self
 
 from pydantic import (
     Field,
@@ -40,6 +40,27 @@ class UserRead(UserBase, IDModel, TimestampModel):
         return ""
 
 
+# Restored from access token claims in stateless mode or from the user
+# cache, both carry no password hash
+class UserPrincipal(UserRead):
+    password_set: bool = Field(False, exclude=True)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def has_password(self) -> bool:
+        return self.password_set or bool(self.hashed_password)
+
+    @classmethod
+    def from_claims(cls, claims: dict[str, Any]) -> Self:
+        return cls.model_validate(
+            {
+                **claims,
+                "id": claims["sub"],
+                "password_set": claims.get("has_password", False),
+            }
+        )
+
+
 class UserCreate(UserBase):
     first_name: str = Field(examples=["John"])
     last_name: str | None = Field(None, examples=["Doe"])
@@ -75,7 +96,7 @@ class NotifyVia(StrEnum):
 
 
 class BearerToken(BackendBase):
-    token_id: str
+    token_id: str = Field(description="Session (refresh token family) id")
     access_token: str
     refresh_token: str
     token_type: Literal["bearer"] = "bearer"
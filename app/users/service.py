@@ -1,17 +1,28 @@
-import random
-import secrets
-import string
+import functools
+import time
 import uuid
 from typing import assert_never, Any
 
 from jwt import InvalidTokenError
+from sqlalchemy.exc import IntegrityError
 
 from app.config import settings
 from app.db.schemas import PageParams, Page
 from app.db.types import ID
 from app.exceptions import InvalidRequest
-from app.security.hashing import crypt_ctx
-from app.security.tokens import encode_jwt, decode_jwt
+from app.limiter.dependencies import rate_limiter
+from app.limiter.exceptions import RateLimited
+from app.obs import panels
+from app.security.schemas import IntrospectionResponse, TokenIntrospection
+from app.security.tokens import (
+    encode_jwt,
+    decode_claims,
+    Claims,
+    peek_claims,
+    TokenParams,
+    TokenFormat,
+    build_claims,
+)
 from app.service import Service
 from app.oauth.dependencies import SSOName
 from app.sso_accounts.schemas import SSOAccountRead, SSOAccountCreate
@@ -27,8 +38,16 @@ from app.users.exceptions import (
     SSOAlreadyAssociatedAnotherUser,
     UserTelegramNotFound,
     VerifyTokenRequired,
+    RefreshTokenReused,
+    TokenRevoked,
+    Unauthorized,
 )
 from app.users.auth import AuthorizationForm
+from app.users.codes import ICodeEngine, get_code_engine
+from app.users.constants import STATELESS_CLAIMS
+from app.users.hashing import password_hasher
+from app.users.revocation import revocation_list
+from app.users.sessions import SessionStore
 from app.users.schemas import (
     UserUpdate,
     UserRead,
@@ -39,16 +58,33 @@ from app.users.schemas import (
     NotifyVia,
     ResetPassword,
     VerifyToken,
+    UserPrincipal,
 )
 from app.users.tokens import (
     access_params,
     refresh_params,
     get_token_params,
     verify_params,
+    reference_store,
+)
+from app.users.versions import (
+    get_user_version,
+    invalidate_principal,
+    issue_user_version,
 )
 
 
 class UserService(Service):
+    @functools.cached_property
+    def sessions(self) -> SessionStore:
+        return SessionStore(
+            self.cache, expire=settings.auth.jwt_refresh_expire
+        )
+
+    @functools.cached_property
+    def codes(self) -> ICodeEngine:
+        return get_code_engine(self.cache)
+
     async def get_by_email(self, email: str) -> UserRead | None:
         return await self.uow.users.get_by_email(email)
 
@@ -69,10 +105,13 @@ class UserService(Service):
         is_verified: bool = False,
         is_superuser: bool = False,
     ) -> UserRead:
+        # Spares hashing for taken emails, the insert closes the race
         if email and (await self.get_by_email(email)):
             raise UserAlreadyExists()
-        hashed_password = crypt_ctx.hash(password) if password else None
-        user = await self.uow.users.create(
+        hashed_password = (
+            await password_hasher.hash(password) if password else None
+        )
+        user = await self.uow.users.create_unique(
             email=email,
             hashed_password=hashed_password,
             is_verified=is_verified,
@@ -81,6 +120,8 @@ class UserService(Service):
             last_name=last_name,
             telegram_id=telegram_id,
         )
+        if user is None:
+            raise UserAlreadyExists()
         if not is_verified:
             await self.send_code(via=NotifyVia.email, email=email)
         return user
@@ -110,31 +151,72 @@ class UserService(Service):
             await self.validate_token(
                 verify_token, token_type=TokenType.verify
             )
+        new_email = update.email if update.email != user.email else None
+        if new_email and (await self.get_by_email(new_email)):
+            raise UserAlreadyExists()
         update_data = update.model_dump(
             exclude={"password"},
             exclude_none=True,
         )
         if update.password is not None:
-            update_data["hashed_password"] = crypt_ctx.hash(update.password)
-        return await self.uow.users.update(user.id, **update_data)
+            update_data["hashed_password"] = await password_hasher.hash(
+                update.password
+            )
+        try:
+            user = await self.uow.users.update(
+                user.id, before=user, **update_data
+            )
+        except IntegrityError as e:
+            # Taken by a concurrent request since the check
+            if new_email:
+                raise UserAlreadyExists() from e
+            raise
+        await invalidate_principal(self.uow, self.cache, user.id)
+        if update.password is not None:
+            await self.sessions.revoke_all(user.id)
+        return user
 
     async def delete(self, user: UserRead) -> UserRead:
-        return await self.uow.users.delete(user.id)
+        user = await self.uow.users.delete(user.id)
+        await invalidate_principal(self.uow, self.cache, user.id)
+        await self.sessions.revoke_all(user.id)
+        return user
 
-    @staticmethod
-    def create_token(
+    async def create_token(
+        self,
         user: UserRead,
     ) -> BearerToken:
-        access_token = encode_jwt(
+        family_id = str(uuid.uuid4())
+        refresh_jti = str(uuid.uuid4())
+        await self.sessions.create(user.id, family_id, refresh_jti)
+        return await self.issue_token(user, family_id, refresh_jti)
+
+    async def issue_token(
+        self,
+        user: UserRead,
+        family_id: str,
+        refresh_jti: str,
+    ) -> BearerToken:
+        payload: dict[str, Any] = {}
+        if settings.auth.jwt_stateless:
+            payload = user.model_dump(mode="json", include=STATELESS_CLAIMS)
+            payload["ver"] = await issue_user_version(self.cache, user.id)
+        access_token = await self.encode_token(
             access_params,
             subject=str(user.id),
             email=user.email,
             first_name=user.first_name,
             last_name=user.last_name,
+            **payload,
+        )
+        refresh_token = await self.encode_token(
+            refresh_params,
+            subject=str(user.id),
+            jti=refresh_jti,
+            fid=family_id,
         )
-        refresh_token = encode_jwt(refresh_params, subject=str(user.id))
         return BearerToken(
-            token_id=str(uuid.uuid4()),
+            token_id=family_id,
             access_token=access_token,
             refresh_token=refresh_token,
             expires_in=int(refresh_params.expires_in.total_seconds()),
@@ -144,59 +226,173 @@ class UserService(Service):
         self,
         form: AuthorizationForm,
     ) -> UserRead:
-        user = await self.get_by_email(form.username)
+        user = await self.uow.users.get_credentials(form.username)
         if not user:
             raise UserEmailNotFound()
-        if not crypt_ctx.verify(form.password, user.hashed_password):
+        verified, new_hash = await password_hasher.verify_and_update(
+            form.password, user.hashed_password
+        )
+        if not verified:
             raise WrongPassword()
+        if new_hash is not None:
+            user = await self.uow.users.update(
+                user.id, before=user, hashed_password=new_hash
+            )
         return user
 
+    @staticmethod
+    async def encode_token(
+        params: TokenParams, *, subject: str, **payload: Any
+    ) -> str:
+        if params.format == TokenFormat.reference:
+            claims = build_claims(params, subject=subject, **payload)
+            return await reference_store.encode(claims)
+        return encode_jwt(params, subject=subject, **payload)
+
+    @staticmethod
+    async def decode_token(
+        token: str, token_type: TokenType = TokenType.access
+    ) -> Claims:
+        params = get_token_params(token_type)
+        if params.format == TokenFormat.reference:
+            reference_claims = await reference_store.decode(params, token)
+            if reference_claims is None:
+                raise InvalidToken()
+            claims = reference_claims
+        else:
+            try:
+                claims = decode_claims(params, token)
+            except InvalidTokenError as e:
+                raise InvalidToken() from e
+        if claims.get("typ") != token_type:
+            raise InvalidTokenType()
+        if "jti" in claims and await revocation_list.is_revoked(claims["jti"]):
+            raise TokenRevoked()
+        return claims
+
     async def validate_token(
         self, token: str, token_type: TokenType = TokenType.access
     ) -> UserRead:
-        params = get_token_params(token_type)
+        claims = await self.decode_token(token, token_type)
+        user_id = uuid.UUID(claims["sub"], version=4)
+        # An unknown version never matches, the user is loaded instead
+        if (
+            settings.auth.jwt_stateless
+            and "ver" in claims
+            and claims["ver"] == await get_user_version(self.cache, user_id)
+        ):
+            return UserPrincipal.from_claims(claims)
+        return await self.get_one(user_id)
+
+    async def refresh_token(self, token: str) -> BearerToken:
+        claims = await self.decode_token(token, TokenType.refresh)
+        user_id = uuid.UUID(claims["sub"], version=4)
+        refresh_jti = str(uuid.uuid4())
+        family_id = claims.get("fid")
+        if family_id is None:
+            # Issued before rotation was introduced: retire it and start a
+            # new family. Only the first of concurrent uses gets through
+            if not await revocation_list.revoke(
+                claims["jti"], expire=int(claims["exp"] - time.time())
+            ):
+                raise RefreshTokenReused()
+            family_id = str(uuid.uuid4())
+            await self.sessions.create(user_id, family_id, refresh_jti)
+        elif not await self.sessions.rotate(
+            user_id, family_id, claims["jti"], refresh_jti
+        ):
+            raise RefreshTokenReused()
+        user = await self.get_one(user_id)
+        return await self.issue_token(user, family_id, refresh_jti)
+
+    async def try_decode_token(self, token: str) -> Claims | None:
         try:
-            payload = decode_jwt(params, token)
-        except InvalidTokenError as e:
-            raise InvalidToken() from e
-        if payload.typ != token_type:
-            raise InvalidTokenType()
-        return await self.get_one(uuid.UUID(payload.sub, version=4))
+            if (
+                access_params.format == TokenFormat.reference
+                and token.count(".") != 2
+            ):
+                token_type = TokenType.access
+            else:
+                token_type = TokenType(peek_claims(token).get("typ"))
+            return await self.decode_token(token, token_type)
+        except (InvalidTokenError, ValueError, Unauthorized):
+            return None
 
-    async def refresh_token(self, token: str) -> UserRead:
-        return await self.validate_token(token, TokenType.refresh)
+    async def revoke_token(self, token: str) -> None:
+        claims = await self.try_decode_token(token)
+        if claims is None:
+            # RFC 7009: invalid tokens need no revocation
+            return
+        await revocation_list.revoke(
+            claims["jti"], expire=int(claims["exp"] - time.time())
+        )
+        params = get_token_params(claims["typ"])
+        if params.format == TokenFormat.reference:
+            await reference_store.delete(params, token)
+        if "fid" in claims:
+            await self.sessions.revoke(
+                uuid.UUID(claims["sub"], version=4), claims["fid"]
+            )
+
+    async def introspect(self, tokens: list[str]) -> IntrospectionResponse:
+        decoded = [await self.try_decode_token(token) for token in tokens]
+        user_ids = {
+            uuid.UUID(claims["sub"], version=4) for claims in decoded if claims
+        }
+        users = (
+            {
+                str(user.id): user
+                for user in await self.uow.users.get_by_ids(user_ids)
+            }
+            if user_ids
+            else {}
+        )
+        results = []
+        for claims in decoded:
+            user = users.get(claims["sub"]) if claims else None
+            if claims is None or user is None or not user.is_active:
+                results.append(TokenIntrospection(active=False))
+                continue
+            results.append(
+                TokenIntrospection(
+                    active=True,
+                    token_type=claims["typ"],
+                    username=user.email,
+                    **claims,
+                )
+            )
+        return IntrospectionResponse(results=results)
 
     async def authorize(self, form: AuthorizationForm) -> BearerToken:
         match form.grant_type:
             case GrantType.password:
                 user = await self.authorize_password(form)
+                return await self.create_token(user)
             case GrantType.refresh_token:
                 assert form.refresh_token
-                user = await self.refresh_token(form.refresh_token)
+                return await self.refresh_token(form.refresh_token)
             case _:
                 assert_never(form.grant_type)
-        return self.create_token(user)
 
-    async def create_code(self, user: UserRead) -> str:
-        code = "".join(
-            random.choices(string.digits, k=settings.auth.code_length)
-        )
-        await self.cache.add(
-            f"codes:{user.id}", code, expire=settings.auth.code_expire
+    @staticmethod
+    async def check_cooldown(user: UserRead) -> None:
+        retry_after = await rate_limiter.cooldown(
+            f"codes:{user.id}", settings.limiter.code_cooldown
         )
-        return code
+        if retry_after:
+            panels.RATE_LIMITED.labels(policy="code:cooldown").inc()
+            raise RateLimited(headers={"Retry-After": str(retry_after)})
 
     async def send_code_email(self, email: str | None) -> None:
         if email is None:
             raise InvalidRequest("Email is not set")
         user = await self.get_one_by_email(email)
-        code = await self.create_code(user)
-        self.background.add_task(
-            self.mail.send,
+        await self.check_cooldown(user)
+        await self.send_mail(
             user,
             "Your verification code",
             "code",
-            code=code,  # noqa
+            code_for=user.id,
         )
 
     async def send_code_telegram(self, telegram_id: int | None) -> None:
@@ -205,12 +401,10 @@ class UserService(Service):
         user = await self.uow.users.get_by_telegram_id(telegram_id)
         if user is None:
             raise UserTelegramNotFound()
-        code = await self.create_code(user)
-        self.background.add_task(
-            self.bot.send_message,
-            telegram_id,
-            f"Your verification code: {code}",
-        )  # noqa
+        await self.check_cooldown(user)
+        await self.send_telegram(
+            telegram_id, "Your verification code: {code}", code_for=user.id
+        )
 
     async def send_code(
         self,
@@ -228,12 +422,8 @@ class UserService(Service):
                 assert_never(via)
 
     async def validate_code(self, user: UserRead, code: str) -> None:
-        user_code = await self.cache.get(f"codes:{user.id}", cast=str)
-        if user_code is None:
+        if not await self.codes.validate(user.id, code):
             raise WrongCode()
-        if not secrets.compare_digest(user_code, code):
-            raise WrongCode()
-        await self.cache.delete(f"codes:{user.id}")
 
     async def verify_code(self, user: UserRead, code: str) -> VerifyToken:
         await self.validate_code(user, code)
@@ -245,9 +435,14 @@ class UserService(Service):
     async def reset_password(self, reset: ResetPassword) -> UserRead:
         user = await self.get_one_by_email(reset.email)
         await self.validate_code(user, reset.code)
-        return await self.uow.users.update(
-            user.id, hashed_password=crypt_ctx.hash(reset.password)
+        user = await self.uow.users.update(
+            user.id,
+            before=user,
+            hashed_password=await password_hasher.hash(reset.password),
         )
+        await invalidate_principal(self.uow, self.cache, user.id)
+        await self.sessions.revoke_all(user.id)
+        return user
 
     async def get_many(self, params: PageParams) -> Page[UserRead]:
         return await self.uow.users.get_many(params)
@@ -260,7 +455,9 @@ class UserService(Service):
                 update_data = {"is_superuser": True}
             case _:
                 assert_never(role)
-        return await self.uow.users.update(user.id, **update_data)
+        user = await self.uow.users.update(user.id, before=user, **update_data)
+        await invalidate_principal(self.uow, self.cache, user.id)
+        return user
 
     async def get_login_url(
         self, provider: SSOName, redirect_uri: str, state: str
@@ -316,7 +513,7 @@ class UserService(Service):
             user = await self.get_one(account.user_id)
         else:
             user = await self.sso_register(data)
-        return self.create_token(user)
+        return await self.create_token(user)
 
     async def sso_connect(
         self,
@@ -333,8 +530,9 @@ class UserService(Service):
                 raise SSOAlreadyAssociatedAnotherUser()
         if data.provider == "telegram":
             await self.uow.users.update(
-                user.id, telegram_id=int(data.account_id)
+                user.id, before=user, telegram_id=int(data.account_id)
             )
+            await invalidate_principal(self.uow, self.cache, user.id)
         return await self.uow.sso_accounts.create(
             user_id=user.id, **data.model_dump()
         )
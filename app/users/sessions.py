@@ -0,0 +1,86 @@
+from app.cache.adapter import CacheAdapter
+from app.db.types import ID
+
+# Every family field is "<jti> <expires at>", expired fields are dropped on
+# each write, so the hash only holds live families. Fields written before
+# expiry was recorded are only a jti, they are kept until rotated
+PRUNE = """
+local time = redis.call('TIME')
+local now = tonumber(time[1])
+local fields = redis.call('HGETALL', KEYS[1])
+for i = 1, #fields, 2 do
+    local expires_at = string.match(fields[i + 1], ' (%d+)$')
+    if expires_at and tonumber(expires_at) <= now then
+        redis.call('HDEL', KEYS[1], fields[i])
+    end
+end
+"""
+
+# KEYS[1] - user sessions hash, ARGV - family id, jti, ttl
+CREATE_SCRIPT = (
+    PRUNE
+    + """
+local ttl = tonumber(ARGV[3])
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2] .. ' ' .. (now + ttl))
+redis.call('EXPIRE', KEYS[1], ttl)
+"""
+)
+
+# KEYS[1] - user sessions hash, ARGV - family id, presented jti, new jti, ttl
+ROTATE_SCRIPT = (
+    PRUNE
+    + """
+local ttl = tonumber(ARGV[4])
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current and string.match(current, '^(%S+)') == ARGV[2] then
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[3] .. ' ' .. (now + ttl))
+    redis.call('EXPIRE', KEYS[1], ttl)
+    return 1
+end
+redis.call('HDEL', KEYS[1], ARGV[1])
+return 0
+"""
+)
+
+
+class SessionStore:
+    """Refresh token families of each user.
+
+    Every user has a hash mapping a family id to the jti of the only refresh
+    token of that family that may still be used, and the time the family
+    expires. The hash expires with its most recently used family.
+    """
+
+    cache: CacheAdapter
+    expire: int
+
+    def __init__(self, cache: CacheAdapter, *, expire: int):
+        self.cache = cache
+        self.expire = expire
+        self.create_script = cache.client.register_script(CREATE_SCRIPT)
+        self.rotate_script = cache.client.register_script(ROTATE_SCRIPT)
+
+    def get_key(self, user_id: ID) -> str:
+        return f"{self.cache.key}:users:{user_id}:sessions"
+
+    async def create(self, user_id: ID, family_id: str, jti: str) -> None:
+        await self.create_script(
+            keys=[self.get_key(user_id)],
+            args=[family_id, jti, self.expire],
+        )
+
+    async def rotate(
+        self, user_id: ID, family_id: str, jti: str, new_jti: str
+    ) -> bool:
+        """Replaces the family jti. Revokes the family on reuse."""
+        rotated = await self.rotate_script(
+            keys=[self.get_key(user_id)],
+            args=[family_id, jti, new_jti, self.expire],
+        )
+        return bool(rotated)
+
+    async def revoke(self, user_id: ID, family_id: str) -> None:
+        await self.cache.client.hdel(self.get_key(user_id), family_id)
+
+    async def revoke_all(self, user_id: ID) -> None:
+        await self.cache.client.delete(self.get_key(user_id))
@@ -1,38 +1,26 @@
-import datetime
 from typing import assert_never
 
+from app.cache.dependencies import redis_client
 from app.config import settings
+from app.security.references import ReferenceTokenStore
 from app.security.tokens import TokenParams
 from app.users.schemas import (
     TokenType,
 )
 
-access_params = TokenParams(
-    issuer=settings.auth.jwt_issuer,
-    audience=settings.auth.jwt_audience,
-    algorithm=settings.auth.jwt_algorithm,
-    private_key=settings.auth.jwt_private_key.read_text(),
-    public_key=settings.auth.jwt_public_key.read_text(),
-    type=TokenType.access,
-    expires_in=datetime.timedelta(seconds=settings.auth.jwt_access_expire),
+access_params = settings.auth.get_token_params(
+    TokenType.access,
+    settings.auth.jwt_access_expire,
+    settings.auth.access_token_format,
 )
-refresh_params = TokenParams(
-    issuer=settings.auth.jwt_issuer,
-    audience=settings.auth.jwt_audience,
-    algorithm=settings.auth.jwt_algorithm,
-    private_key=settings.auth.jwt_private_key.read_text(),
-    public_key=settings.auth.jwt_public_key.read_text(),
-    type=TokenType.refresh,
-    expires_in=datetime.timedelta(seconds=settings.auth.jwt_refresh_expire),
+refresh_params = settings.auth.get_token_params(
+    TokenType.refresh, settings.auth.jwt_refresh_expire
 )
-verify_params = TokenParams(
-    issuer=settings.auth.jwt_issuer,
-    audience=settings.auth.jwt_audience,
-    algorithm=settings.auth.jwt_algorithm,
-    private_key=settings.auth.jwt_private_key.read_text(),
-    public_key=settings.auth.jwt_public_key.read_text(),
-    type=TokenType.verify,
-    expires_in=datetime.timedelta(seconds=settings.auth.code_expire),
+verify_params = settings.auth.get_token_params(
+    TokenType.verify, settings.auth.code_expire
+)
+reference_store = ReferenceTokenStore(
+    redis_client, key=settings.cache.redis_key
 )
 
 
@@ -0,0 +1,41 @@
+import secrets
+
+from app.cache.adapter import CacheAdapter
+from app.db.types import ID
+from app.db.uow import UOW
+
+
+def version_key(user_id: ID) -> str:
+    return f"users:{user_id}:version"
+
+
+async def get_user_version(cache: CacheAdapter, user_id: ID) -> int | None:
+    """None if the version is unknown, e.g. the key was evicted."""
+    return await cache.get(version_key(user_id), cast=int)
+
+
+async def issue_user_version(cache: CacheAdapter, user_id: ID) -> int:
+    # Starts at a random value, so tokens issued before the key was lost
+    # never match the version it is recreated with
+    key = f"{cache.key}:{version_key(user_id)}"
+    async with cache.client.pipeline(transaction=True) as pipe:
+        pipe.set(key, secrets.randbits(62), nx=True)
+        pipe.get(key)
+        _, version = await pipe.execute()
+    return int(version)
+
+
+async def bump_user_version(cache: CacheAdapter, user_id: ID) -> int:
+    return await cache.incr(version_key(user_id))
+
+
+async def invalidate_principal(
+    uow: UOW, cache: CacheAdapter, user_id: ID
+) -> None:
+    # Bump before and after commit, so a token issued in between
+    # with stale data falls back to the database query
+    async def bump() -> None:
+        await bump_user_version(cache, user_id)
+
+    await bump()
+    uow.after_commit(bump)
@@ -0,0 +1,19 @@
+import os
+
+from dotenv import load_dotenv
+
+from app.cache.config import CacheSettings
+from app.schemas import BackendSettings
+from app.users.config import AuthSettings
+
+if not os.getenv("ENVIRONMENT_SET"):
+    load_dotenv(".env")
+
+
+# Subset of AppSettings, importing app.config would load the whole app
+class VerifierSettings(BackendSettings):
+    app_display_name: str = "FastAPI App Verifier"
+    app_version: str = "0.1.0"
+
+    auth: AuthSettings = AuthSettings()
+    cache: CacheSettings = CacheSettings()
@@ -0,0 +1,58 @@
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+from fastapi import FastAPI
+from redis.asyncio import Redis
+
+from app.exc_handlers import setup_exceptions
+from app.security.references import ReferenceTokenStore
+from app.security.revocation import RevocationList
+from app.verifier.config import VerifierSettings
+from app.verifier.router import router
+from app.verifier.service import TokenVerifier
+
+
+def create_app(settings: VerifierSettings | None = None) -> FastAPI:
+    """Token verification only: no database, admin, SSO or telemetry.
+
+    uvicorn app.verifier.main:create_app --factory --uds /run/auth.sock
+    """
+    settings = settings or VerifierSettings()
+    redis = Redis.from_url(settings.cache.redis_url)
+    revocation_list = RevocationList(
+        redis,
+        key=settings.cache.redis_key,
+        capacity=settings.auth.revocation_capacity,
+        error_rate=settings.auth.revocation_error_rate,
+        rebuild_interval=settings.auth.revocation_rebuild_interval,
+    )
+    verifier = TokenVerifier(
+        settings.auth.get_token_params(
+            "access",
+            settings.auth.jwt_access_expire,
+            settings.auth.access_token_format,
+            signing=False,
+        ),
+        references=ReferenceTokenStore(redis, key=settings.cache.redis_key),
+        revocation_list=revocation_list,
+    )
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+        await revocation_list.start()
+        yield
+        await revocation_list.stop()
+        await redis.aclose()
+
+    app = FastAPI(
+        lifespan=lifespan,
+        title=settings.app_display_name,
+        version=settings.app_version,
+        summary="Access token verification",
+        root_path="/api/v1",
+    )
+    app.state.settings = settings
+    app.state.verifier = verifier
+    setup_exceptions(app)
+    app.include_router(router)
+    return app
@@ -0,0 +1,82 @@
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.security.utils import get_authorization_scheme_param
+from starlette import status
+
+from app.security.schemas import (
+    IntrospectionRequest,
+    IntrospectionResponse,
+    TokenIntrospection,
+)
+from app.users.constants import TOKEN_COOKIE_NAME, TOKEN_HEADER_NAME
+from app.users.exceptions import NoTokenProvided
+from app.verifier.service import TokenVerifier
+
+
+def get_verifier(request: Request) -> TokenVerifier:
+    return request.app.state.verifier  # type: ignore[no-any-return]
+
+
+VerifierDep = Annotated[TokenVerifier, Depends(get_verifier)]
+
+
+def get_token(request: Request) -> str:
+    if token := request.cookies.get(TOKEN_COOKIE_NAME):
+        return token
+    scheme, param = get_authorization_scheme_param(
+        request.headers.get(TOKEN_HEADER_NAME)
+    )
+    if scheme.lower() != "bearer" or not param:
+        raise NoTokenProvided()
+    return param
+
+
+router = APIRouter()
+
+
+@router.get(
+    "/auth/verify",
+    description="Checks the access token of the request, for auth_request "
+    "style proxies. The subject is returned in the X-User-Id header.",
+    status_code=status.HTTP_200_OK,
+)
+async def verify(
+    verifier: VerifierDep,
+    token: Annotated[str, Depends(get_token)],
+    response: Response,
+) -> TokenIntrospection:
+    claims = await verifier.verify(token)
+    response.headers["X-User-Id"] = claims["sub"]
+    return TokenIntrospection(
+        active=True,
+        token_type=claims["typ"],
+        username=claims.get("email"),
+        **claims,
+    )
+
+
+@router.post(
+    "/auth/introspect",
+    description="Validates a batch of tokens (RFC 7662 style).",
+    status_code=status.HTTP_200_OK,
+)
+async def introspect(
+    verifier: VerifierDep, request: IntrospectionRequest
+) -> IntrospectionResponse:
+    return await verifier.introspect(request.tokens)
+
+
+@router.get("/.well-known/jwks.json", status_code=status.HTTP_200_OK)
+def jwks(verifier: VerifierDep, request: Request) -> Response:
+    max_age = request.app.state.settings.auth.jwt_jwks_max_age
+    return Response(
+        content=verifier.jwks_content,
+        media_type="application/json",
+        headers={"Cache-Control": f"public, max-age={max_age}"},
+    )
+
+
+@router.get("/hc", include_in_schema=False)
+def hc() -> dict[str, Any]:
+    return {"status": "ok"}
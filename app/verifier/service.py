@@ -0,0 +1,82 @@
+import json
+
+from jwt import InvalidTokenError
+
+from app.security.references import ReferenceTokenStore
+from app.security.revocation import RevocationList
+from app.security.schemas import IntrospectionResponse, TokenIntrospection
+from app.security.tokens import (
+    Claims,
+    TokenFormat,
+    TokenParams,
+    decode_claims,
+)
+from app.users.exceptions import (
+    InvalidToken,
+    InvalidTokenType,
+    TokenRevoked,
+    Unauthorized,
+)
+
+
+class TokenVerifier:
+    """Checks access tokens without the database.
+
+    A token is active while its signature (or reference) is valid, it has
+    not expired and its jti has not been revoked. Unlike the main app, user
+    state such as is_active is not checked.
+    """
+
+    params: TokenParams
+    references: ReferenceTokenStore
+    revocation_list: RevocationList
+    jwks_content: bytes
+
+    def __init__(
+        self,
+        params: TokenParams,
+        *,
+        references: ReferenceTokenStore,
+        revocation_list: RevocationList,
+    ):
+        self.params = params
+        self.references = references
+        self.revocation_list = revocation_list
+        self.jwks_content = json.dumps(params.codec.jwks()).encode()
+
+    async def verify(self, token: str) -> Claims:
+        if self.params.format == TokenFormat.reference:
+            reference_claims = await self.references.decode(self.params, token)
+            if reference_claims is None:
+                raise InvalidToken()
+            claims = reference_claims
+        else:
+            try:
+                claims = decode_claims(self.params, token)
+            except InvalidTokenError as e:
+                raise InvalidToken() from e
+        if claims.get("typ") != self.params.type:
+            raise InvalidTokenType()
+        if "jti" in claims and await self.revocation_list.is_revoked(
+            claims["jti"]
+        ):
+            raise TokenRevoked()
+        return claims
+
+    async def introspect(self, tokens: list[str]) -> IntrospectionResponse:
+        results = []
+        for token in tokens:
+            try:
+                claims = await self.verify(token)
+            except Unauthorized:
+                results.append(TokenIntrospection(active=False))
+                continue
+            results.append(
+                TokenIntrospection(
+                    active=True,
+                    token_type=claims["typ"],
+                    username=claims.get("email"),
+                    **claims,
+                )
+            )
+        return IntrospectionResponse(results=results)
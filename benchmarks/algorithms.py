@@ -0,0 +1,45 @@
+"""Sign and verify throughput of the supported JWT algorithms.
+
+Usage: python -m benchmarks.algorithms [-n NUMBER] [ALGORITHM ...]
+"""
+
+import argparse
+import secrets
+import timeit
+import uuid
+
+from app.security.keys import generate_key_pair
+from app.security.tokens import JWTCodec
+
+ALGORITHMS = ["HS256", "RS256", "PS256", "ES256", "EdDSA"]
+
+
+def get_codec(algorithm: str) -> JWTCodec:
+    if algorithm.startswith("HS"):
+        secret = secrets.token_hex(32)
+        return JWTCodec(algorithm, secret, secret)
+    private_key, public_key = generate_key_pair(algorithm)
+    return JWTCodec(algorithm, private_key, public_key)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("algorithms", nargs="*", default=ALGORITHMS)
+    parser.add_argument("-n", "--number", type=int, default=1000)
+    args = parser.parse_args()
+
+    claims = {"sub": str(uuid.uuid4()), "typ": "access"}
+    print(f"{'algorithm':<10} {'sign ops/s':>12} {'verify ops/s':>12} size")
+    for algorithm in args.algorithms:
+        codec = get_codec(algorithm)
+        token = codec.encode(claims)
+        sign = timeit.timeit(lambda: codec.encode(claims), number=args.number)
+        verify = timeit.timeit(lambda: codec.decode(token), number=args.number)
+        print(
+            f"{algorithm:<10} {args.number / sign:>12.0f} "
+            f"{args.number / verify:>12.0f} {len(token)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Argon2 cost calibration for the password hasher.
+
+Run on the slowest host of the fleet and put the result in the settings,
+every host must hash with the same cost.
+
+Usage: python -m benchmarks.hashing [-t TARGET] [-m MAX_MEMORY_COST]
+"""
+
+import argparse
+
+from app.security.hashing import calibrate_argon2, measure_argon2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-t", "--target", type=float, default=0.25, help="seconds per verify"
+    )
+    parser.add_argument(
+        "-m", "--max-memory-cost", type=int, default=64 * 1024, help="KiB"
+    )
+    parser.add_argument("-p", "--parallelism", type=int, default=4)
+    args = parser.parse_args()
+
+    time_cost, memory_cost = calibrate_argon2(
+        args.target,
+        parallelism=args.parallelism,
+        max_memory_cost=args.max_memory_cost,
+    )
+    elapsed = measure_argon2(time_cost, memory_cost, args.parallelism)
+    print(f"# verify takes {elapsed * 1000:.0f} ms")
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_MEMORY_COST={memory_cost}")
+    print(f"ARGON2_PARALLELISM={args.parallelism}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""JWT encode/decode throughput: PEM strings + pydantic vs cached codec.
+
+Usage: python -m benchmarks.tokens [-n NUMBER]
+"""
+
+import argparse
+import datetime
+import timeit
+import uuid
+from typing import Any
+
+import jwt
+
+from app.security.keys import generate_key_pair
+from app.security.tokens import (
+    JWTClaims,
+    TokenParams,
+    decode_claims,
+    encode_jwt,
+)
+
+
+# Previous implementation, kept here as the baseline
+def legacy_encode(params: TokenParams, *, subject: str, **payload: Any) -> str:
+    now = datetime.datetime.now(datetime.UTC)
+    claims = JWTClaims(
+        iss=params.issuer,
+        aud=params.audience,
+        typ=params.type,
+        sub=subject,
+        iat=now,
+        nbf=now,
+        exp=now + params.expires_in,
+        **payload,
+    )
+    return jwt.encode(
+        claims.model_dump(
+            mode="json",
+            exclude_none=True,
+            include=params.include,
+            exclude=params.exclude,
+        ),
+        params.private_key,
+        algorithm=params.algorithm,
+    )
+
+
+def legacy_decode(params: TokenParams, token: str) -> JWTClaims:
+    decoded = jwt.decode(
+        token,
+        params.public_key,
+        algorithms=[params.algorithm],
+        issuer=params.issuer,
+        audience=params.audience,
+    )
+    return JWTClaims.model_validate(decoded)
+
+
+def report(name: str, number: int, seconds: float) -> None:
+    print(f"{name:<16} {number / seconds:>10.0f} ops/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=500)
+    number = parser.parse_args().number
+
+    private_key, public_key = generate_key_pair("RS256")
+    params = TokenParams(
+        issuer="benchmark",
+        audience=["https://example.com"],
+        algorithm="RS256",
+        private_key=private_key,
+        public_key=public_key,
+        type="access",
+        expires_in=datetime.timedelta(hours=1),
+    )
+    payload = {
+        "subject": str(uuid.uuid4()),
+        "email": "user@example.com",
+        "first_name": "John",
+        "last_name": "Doe",
+    }
+    token = encode_jwt(params, **payload)
+
+    report(
+        "encode (before)",
+        number,
+        timeit.timeit(lambda: legacy_encode(params, **payload), number=number),
+    )
+    report(
+        "encode (after)",
+        number,
+        timeit.timeit(lambda: encode_jwt(params, **payload), number=number),
+    )
+    report(
+        "decode (before)",
+        number,
+        timeit.timeit(lambda: legacy_decode(params, token), number=number),
+    )
+    report(
+        "decode (after)",
+        number,
+        timeit.timeit(lambda: decode_claims(params, token), number=number),
+    )
+
+
+if __name__ == "__main__":
+    main()
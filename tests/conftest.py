@@ -1,14 +1,20 @@
 from typing import AsyncGenerator, Any
 
 import pytest
+from httpx import ASGITransport, AsyncClient
+from redis.asyncio import Redis
 from sqlalchemy import pool
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.adapter import CacheAdapter
 from app.config import settings
 from app.db.connection import (
     get_async_engine,
     get_async_session_factory,
 )
+from app.db.dependencies import get_uow
+from app.db.uow import UOW
+from app.main import app
 from tests.utils.alembic import alembic_upgrade_head, alembic_config_from_url
 from tests.utils.db import get_test_db_url, temporary_db, delete_all
 
@@ -36,3 +42,35 @@ async def session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
     await delete_all(test_engine)
+
+
+@pytest.fixture
+async def redis() -> AsyncGenerator[Redis, None]:
+    client = Redis.from_url(settings.cache.redis_url)
+    yield client
+    keys = await client.keys("test:*")
+    if keys:
+        await client.delete(*keys)
+    await client.aclose()
+
+
+@pytest.fixture
+def cache(redis: Redis) -> CacheAdapter:
+    return CacheAdapter(redis, key="test")
+
+
+async def get_test_uow() -> AsyncGenerator[UOW, None]:
+    async with UOW(test_factory) as uow:
+        yield uow
+
+
+@pytest.fixture
+async def client(
+    session: AsyncSession,
+) -> AsyncGenerator[AsyncClient, None]:
+    app.dependency_overrides[get_uow] = get_test_uow
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+    app.dependency_overrides.clear()
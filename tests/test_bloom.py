@@ -0,0 +1,70 @@
+from typing import AsyncIterator
+
+from redis.asyncio import Redis
+
+from app.cache.bloom import BloomFilter, SharedBloomFilter
+
+
+class ListBloomFilter(SharedBloomFilter):
+    def __init__(self, redis: Redis, items: list[str]):
+        super().__init__(
+            redis,
+            "test:bloom",
+            name="test",
+            capacity=1000,
+            error_rate=0.01,
+            rebuild_interval=60,
+        )
+        self.items = items
+
+    async def scan(self) -> AsyncIterator[str]:
+        for item in list(self.items):
+            yield item
+            # A publish received while the rebuild scans
+            if item == "b":
+                self.add("late")
+
+
+def test_has_no_false_negatives() -> None:
+    bloom = BloomFilter(1000, 0.01)
+    items = [f"user{i}@example.com" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    assert bloom.count == 1000
+
+
+def test_false_positive_rate_is_near_error_rate() -> None:
+    bloom = BloomFilter(1000, 0.01)
+    for i in range(1000):
+        bloom.add(f"user{i}@example.com")
+    false_positives = sum(
+        f"other{i}@example.com" in bloom for i in range(10_000)
+    )
+    assert false_positives / 10_000 < 0.02
+    assert 0.005 < bloom.estimated_error_rate < 0.02
+
+
+async def test_might_contain_everything_until_loaded(redis: Redis) -> None:
+    bloom = ListBloomFilter(redis, ["a"])
+    assert bloom.might_contain("missing")
+    await bloom.load()
+    assert bloom.might_contain("a")
+    assert not bloom.might_contain("missing")
+    bloom.unload()
+    assert bloom.might_contain("missing")
+
+
+async def test_load_keeps_items_added_during_scan(redis: Redis) -> None:
+    bloom = ListBloomFilter(redis, ["a", "b", "c"])
+    await bloom.load()
+    assert bloom.might_contain("late")
+    assert bloom.pending is None
+
+
+async def test_rebuild_drops_removed_items(redis: Redis) -> None:
+    bloom = ListBloomFilter(redis, ["a", "gone"])
+    await bloom.load()
+    bloom.items.remove("gone")
+    await bloom.load()
+    assert not bloom.might_contain("gone")
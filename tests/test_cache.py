@@ -0,0 +1,39 @@
+from app.cache.adapter import CacheAdapter
+
+
+async def test_consume_matching_value(cache: CacheAdapter) -> None:
+    await cache.add("code", "123456", expire=60)
+    assert not await cache.consume("code", "000000", max_attempts=3)
+    assert await cache.consume("code", "123456", max_attempts=3)
+    assert await cache.get("code") is None
+    assert await cache.get("code:attempts") is None
+
+
+async def test_consume_drops_after_max_attempts(cache: CacheAdapter) -> None:
+    await cache.add("code", "123456", expire=60)
+    for _ in range(3):
+        assert not await cache.consume("code", "000000", max_attempts=3)
+    assert await cache.get("code") is None
+    assert not await cache.consume("code", "123456", max_attempts=3)
+
+
+async def test_consume_attempts_expire_with_value(
+    cache: CacheAdapter,
+) -> None:
+    await cache.add("code", "123456", expire=60)
+    await cache.consume("code", "000000", max_attempts=3)
+    ttl = await cache.client.pttl(f"{cache.key}:code:attempts")
+    assert 0 < ttl <= 60_000
+
+
+async def test_consume_missing_key(cache: CacheAdapter) -> None:
+    assert not await cache.consume("missing", "123456", max_attempts=3)
+    assert await cache.get("missing:attempts") is None
+
+
+async def test_attempt_limit(cache: CacheAdapter) -> None:
+    for _ in range(3):
+        assert await cache.attempt("tries", max_attempts=3, expire=60)
+    assert not await cache.attempt("tries", max_attempts=3, expire=60)
+    ttl = await cache.client.ttl(f"{cache.key}:tries")
+    assert 0 < ttl <= 60
@@ -0,0 +1,147 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.cache.adapter import CacheAdapter
+from app.users import codes
+from app.users.codes import CacheCodeEngine, TOTPCodeEngine
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(codes, "time", SimpleNamespace(time=clock))
+    return clock
+
+
+@pytest.fixture
+def totp(cache: CacheAdapter) -> TOTPCodeEngine:
+    return TOTPCodeEngine(
+        b"secret", cache, length=6, step=60, expire=5 * 60, max_attempts=3
+    )
+
+
+def wrong(code: str) -> str:
+    return str((int(code) + 1) % 10**6).zfill(6)
+
+
+def test_derive_is_deterministic(totp: TOTPCodeEngine) -> None:
+    user_id = uuid.uuid4()
+    code = totp.derive(user_id, 42)
+    assert code == totp.derive(user_id, 42)
+    assert len(code) == 6 and code.isdigit()
+    assert code != totp.derive(user_id, 43)
+    assert code != totp.derive(uuid.uuid4(), 42)
+
+
+def test_derive_depends_on_secret(cache: CacheAdapter) -> None:
+    user_id = uuid.uuid4()
+    engines = [
+        TOTPCodeEngine(
+            secret, cache, length=6, step=60, expire=60, max_attempts=3
+        )
+        for secret in (b"one", b"two")
+    ]
+    assert engines[0].derive(user_id, 1) != engines[1].derive(user_id, 1)
+
+
+async def test_accepts_codes_within_drift(
+    totp: TOTPCodeEngine, clock: Clock
+) -> None:
+    user_id = uuid.uuid4()
+    code = await totp.create(user_id)
+    clock.now += 5 * 60
+    assert await totp.validate(user_id, code)
+
+
+async def test_rejects_codes_beyond_drift(
+    totp: TOTPCodeEngine, clock: Clock
+) -> None:
+    user_id = uuid.uuid4()
+    code = await totp.create(user_id)
+    clock.now += 6 * 60
+    assert not await totp.validate(user_id, code)
+
+
+async def test_rejects_replayed_code(
+    totp: TOTPCodeEngine, clock: Clock
+) -> None:
+    user_id = uuid.uuid4()
+    code = await totp.create(user_id)
+    assert await totp.validate(user_id, code)
+    assert not await totp.validate(user_id, code)
+
+
+async def test_locks_out_after_max_attempts(
+    totp: TOTPCodeEngine, clock: Clock
+) -> None:
+    user_id = uuid.uuid4()
+    code = await totp.create(user_id)
+    for _ in range(3):
+        assert not await totp.validate(user_id, wrong(code))
+    assert not await totp.validate(user_id, code)
+    # A new code doesn't lift the lockout
+    clock.now += 60
+    assert not await totp.validate(user_id, await totp.create(user_id))
+
+
+async def test_success_resets_attempts(
+    totp: TOTPCodeEngine, clock: Clock
+) -> None:
+    user_id = uuid.uuid4()
+    code = await totp.create(user_id)
+    for _ in range(2):
+        assert not await totp.validate(user_id, wrong(code))
+    assert await totp.validate(user_id, code)
+    clock.now += 60
+    code = await totp.create(user_id)
+    for _ in range(2):
+        assert not await totp.validate(user_id, wrong(code))
+    assert await totp.validate(user_id, code)
+
+
+async def test_cache_code_is_dropped_after_max_attempts(
+    cache: CacheAdapter,
+) -> None:
+    engine = CacheCodeEngine(cache, length=6, expire=60, max_attempts=3)
+    user_id = uuid.uuid4()
+    code = await engine.create(user_id)
+    for _ in range(3):
+        assert not await engine.validate(user_id, wrong(code))
+    assert not await engine.validate(user_id, code)
+
+
+async def test_cache_code_is_consumed(cache: CacheAdapter) -> None:
+    engine = CacheCodeEngine(cache, length=6, expire=60, max_attempts=3)
+    user_id = uuid.uuid4()
+    code = await engine.create(user_id)
+    assert await engine.validate(user_id, code)
+    assert not await engine.validate(user_id, code)
+
+
+async def test_cache_code_is_reused_for_same_ref(cache: CacheAdapter) -> None:
+    engine = CacheCodeEngine(cache, length=6, expire=60, max_attempts=3)
+    user_id = uuid.uuid4()
+    code = await engine.create(user_id, "message")
+    assert await engine.create(user_id, "message") == code
+    await engine.create(user_id, "other")
+    assert await engine.validate(user_id, code) is False
+
+
+async def test_totp_code_stays_valid_after_retry(
+    totp: TOTPCodeEngine, clock: Clock
+) -> None:
+    user_id = uuid.uuid4()
+    code = await totp.create(user_id, "message")
+    clock.now += 60
+    await totp.create(user_id, "message")
+    assert await totp.validate(user_id, code)
@@ -0,0 +1,78 @@
+import asyncio
+from ipaddress import ip_network
+
+import pytest
+from redis.asyncio import Redis
+from starlette.requests import Request
+
+from app.limiter import dependencies
+from app.limiter.dependencies import by_ip
+from app.limiter.limiter import RateLimiter
+
+
+async def test_allows_up_to_limit(redis: Redis) -> None:
+    limiter = RateLimiter(redis, key="test")
+    for _ in range(3):
+        assert await limiter.hit("login", limit=3, window=60) == 0
+    retry_after = await limiter.hit("login", limit=3, window=60)
+    assert 0 < retry_after <= 60
+
+
+async def test_limits_are_per_name(redis: Redis) -> None:
+    limiter = RateLimiter(redis, key="test")
+    assert await limiter.hit("a", limit=1, window=60) == 0
+    assert await limiter.hit("b", limit=1, window=60) == 0
+    assert await limiter.hit("a", limit=1, window=60) > 0
+
+
+async def test_window_slides(redis: Redis) -> None:
+    limiter = RateLimiter(redis, key="test")
+    assert await limiter.hit("login", limit=1, window=1) == 0
+    assert await limiter.hit("login", limit=1, window=1) == 1
+    await asyncio.sleep(1.1)
+    assert await limiter.hit("login", limit=1, window=1) == 0
+
+
+async def test_rejected_hits_are_not_counted(redis: Redis) -> None:
+    limiter = RateLimiter(redis, key="test")
+    assert await limiter.hit("login", limit=1, window=1) == 0
+    for _ in range(5):
+        assert await limiter.hit("login", limit=1, window=1) > 0
+    await asyncio.sleep(1.1)
+    assert await limiter.hit("login", limit=1, window=1) == 0
+
+
+async def test_cooldown(redis: Redis) -> None:
+    limiter = RateLimiter(redis, key="test")
+    assert await limiter.cooldown("codes", 60) == 0
+    assert 0 < await limiter.cooldown("codes", 60) <= 60
+
+
+def get_request(client: str, forwarded: str | None = None) -> Request:
+    headers = []
+    if forwarded is not None:
+        headers.append((b"x-forwarded-for", forwarded.encode()))
+    return Request(
+        {"type": "http", "client": (client, 1234), "headers": headers}
+    )
+
+
+@pytest.fixture
+def proxies(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        dependencies, "trusted_proxies", [ip_network("10.0.0.0/8")]
+    )
+
+
+async def test_by_ip_ignores_untrusted_forwarded_for(proxies: None) -> None:
+    request = get_request("203.0.113.1", "198.51.100.1")
+    assert await by_ip(request) == "203.0.113.1"
+
+
+async def test_by_ip_uses_forwarded_for_from_proxy(proxies: None) -> None:
+    request = get_request("10.0.0.1", "198.51.100.1, 203.0.113.1, 10.0.0.2")
+    assert await by_ip(request) == "203.0.113.1"
+
+
+async def test_by_ip_without_forwarded_for(proxies: None) -> None:
+    assert await by_ip(get_request("10.0.0.1")) == "10.0.0.1"
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.cache import lru
+from app.cache.lru import LRUCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(lru, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def test_evicts_least_recently_used() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_counts_hits_and_misses() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_expires_after_ttl(clock: Clock) -> None:
+    cache: LRUCache[str, int] = LRUCache(2, ttl=10)
+    cache.set("a", 1)
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_item_ttl_is_capped_by_cache_ttl(clock: Clock) -> None:
+    cache: LRUCache[str, int] = LRUCache(2, ttl=10)
+    cache.set("short", 1, ttl=5)
+    cache.set("long", 2, ttl=60)
+    clock.now += 5
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    clock.now += 5
+    assert cache.get("long") is None
+
+
+def test_skips_non_positive_ttl() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.set("a", 1, ttl=0)
+    assert cache.get("a") is None
+
+
+def test_delete_and_clear() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+    cache.delete("missing")
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
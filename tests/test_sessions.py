@@ -0,0 +1,46 @@
+import asyncio
+import uuid
+
+from app.cache.adapter import CacheAdapter
+from app.users.sessions import SessionStore
+
+
+async def test_rotates_current_token(cache: CacheAdapter) -> None:
+    sessions = SessionStore(cache, expire=60)
+    user_id = uuid.uuid4()
+    await sessions.create(user_id, "family", "jti1")
+    assert await sessions.rotate(user_id, "family", "jti1", "jti2")
+    assert await sessions.rotate(user_id, "family", "jti2", "jti3")
+
+
+async def test_reuse_revokes_family(cache: CacheAdapter) -> None:
+    sessions = SessionStore(cache, expire=60)
+    user_id = uuid.uuid4()
+    await sessions.create(user_id, "family", "jti1")
+    await sessions.create(user_id, "other", "jti1")
+    assert await sessions.rotate(user_id, "family", "jti1", "jti2")
+    assert not await sessions.rotate(user_id, "family", "jti1", "jti3")
+    # The legitimate holder is signed out too
+    assert not await sessions.rotate(user_id, "family", "jti2", "jti3")
+    assert await sessions.rotate(user_id, "other", "jti1", "jti2")
+
+
+async def test_revoke_all(cache: CacheAdapter) -> None:
+    sessions = SessionStore(cache, expire=60)
+    user_id = uuid.uuid4()
+    await sessions.create(user_id, "family", "jti1")
+    await sessions.revoke_all(user_id)
+    assert not await sessions.rotate(user_id, "family", "jti1", "jti2")
+
+
+async def test_prunes_expired_families(cache: CacheAdapter) -> None:
+    sessions = SessionStore(cache, expire=1)
+    user_id = uuid.uuid4()
+    key = sessions.get_key(user_id)
+    await sessions.create(user_id, "expired", "jti1")
+    await cache.client.hset(key, "legacy", "jti0")
+    await cache.client.expire(key, 60)
+    await asyncio.sleep(2)
+    sessions.expire = 60
+    await sessions.create(user_id, "family", "jti2")
+    assert set(await cache.client.hkeys(key)) == {b"legacy", b"family"}
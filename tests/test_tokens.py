@@ -0,0 +1,83 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import Counter
+
+from app.cache import lru
+from app.obs import panels
+from app.security.tokens import (
+    TokenParams,
+    cache_key,
+    decode_claims,
+    encode_jwt,
+)
+
+
+KEY = "test-secret-long-enough-for-hs256-keys"
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(lru, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def get_params(token_type: str, expires_in: int = 60) -> TokenParams:
+    return TokenParams(
+        private_key=KEY,
+        public_key=KEY,
+        type=token_type,
+        expires_in=datetime.timedelta(seconds=expires_in),
+        cache_size=10,
+        cache_ttl=60,
+    )
+
+
+def count(counter: Counter, token_type: str) -> float:
+    return counter.labels(token_type=token_type)._value.get()
+
+
+def test_caches_decoded_claims() -> None:
+    params = get_params("test-hit")
+    token = encode_jwt(params, subject="user")
+    hits = count(panels.TOKEN_CACHE_HITS, "test-hit")
+    misses = count(panels.TOKEN_CACHE_MISSES, "test-hit")
+    claims = decode_claims(params, token)
+    assert count(panels.TOKEN_CACHE_MISSES, "test-hit") == misses + 1
+    assert decode_claims(params, token) == claims
+    assert count(panels.TOKEN_CACHE_HITS, "test-hit") == hits + 1
+    assert claims["sub"] == "user"
+
+
+def test_entry_expires_with_token(clock: Clock) -> None:
+    params = get_params("test-exp", expires_in=5)
+    token = encode_jwt(params, subject="user")
+    decode_claims(params, token)
+    assert params.cache is not None
+    clock.now += 4
+    assert params.cache.get(cache_key(token)) is not None
+    # Capped by exp, not by the cache TTL of 60 seconds
+    clock.now += 2
+    assert params.cache.get(cache_key(token)) is None
+
+
+def test_cache_is_per_token_type() -> None:
+    access = get_params("test-access")
+    refresh = get_params("test-refresh")
+    token = encode_jwt(access, subject="user")
+    decode_claims(access, token)
+    assert refresh.cache is not None
+    assert refresh.cache.get(cache_key(token)) is None
+    misses = count(panels.TOKEN_CACHE_MISSES, "test-refresh")
+    decode_claims(refresh, token)
+    assert count(panels.TOKEN_CACHE_MISSES, "test-refresh") == misses + 1
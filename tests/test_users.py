@@ -0,0 +1,34 @@
+import uuid
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import UserOrm
+from app.security.tokens import encode_jwt
+from app.users.tokens import access_params, verify_params
+
+
+async def test_update_to_taken_email_conflicts(
+    session: AsyncSession, client: AsyncClient
+) -> None:
+    user_id = uuid.uuid4()
+    session.add_all(
+        [
+            UserOrm(email="taken@example.com"),
+            UserOrm(id=user_id, email="user@example.com"),
+        ]
+    )
+    await session.commit()
+    response = await client.patch(
+        "/users/me",
+        params={
+            "verify_token": encode_jwt(verify_params, subject=str(user_id))
+        },
+        headers={
+            "Authorization": "Bearer "
+            + encode_jwt(access_params, subject=str(user_id))
+        },
+        json={"email": "taken@example.com"},
+    )
+    assert response.status_code == 409
+    assert response.json()["code"] == "user_already_exists"
@@ -0,0 +1,33 @@
+import uuid
+
+from app.cache.adapter import CacheAdapter
+from app.users.versions import (
+    bump_user_version,
+    get_user_version,
+    issue_user_version,
+    version_key,
+)
+
+
+async def test_issue_keeps_current_version(cache: CacheAdapter) -> None:
+    user_id = uuid.uuid4()
+    version = await issue_user_version(cache, user_id)
+    assert await issue_user_version(cache, user_id) == version
+    assert await get_user_version(cache, user_id) == version
+
+
+async def test_bump_changes_version(cache: CacheAdapter) -> None:
+    user_id = uuid.uuid4()
+    version = await issue_user_version(cache, user_id)
+    assert await bump_user_version(cache, user_id) != version
+    assert await get_user_version(cache, user_id) != version
+
+
+async def test_lost_version_is_unknown(cache: CacheAdapter) -> None:
+    user_id = uuid.uuid4()
+    version = await issue_user_version(cache, user_id)
+    await cache.delete(version_key(user_id))
+    assert await get_user_version(cache, user_id) is None
+    assert await bump_user_version(cache, user_id) != version
+    await cache.delete(version_key(user_id))
+    assert await issue_user_version(cache, user_id) != version